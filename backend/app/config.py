@@ -3,6 +3,8 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Get the base directory of the project
 BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+# String form for subprocess cwd= and other plain-path consumers
+BASE_DIR_STR = str(BASE_DIR)
 
 
 class Settings(BaseSettings):
@@ -16,6 +18,16 @@ class Settings(BaseSettings):
     # Project paths
     TEMP_REPO_DIR: pathlib.Path = BASE_DIR.parent / "temp_repos"
 
+    # Content-addressed cache of Python parse results, reused across analyses.
+    # Off by default: every Python file of every analyzed repo gets an entry
+    PARSE_CACHE_ENABLED: bool = False
+    PARSE_CACHE_DIR: pathlib.Path = BASE_DIR / ".cache" / "parse"
+    # Entries older than this are deleted (default: 7 days)
+    PARSE_CACHE_MAX_AGE_SECONDS: int = 7 * 24 * 60 * 60
+
+    # Max repositories downloaded/cloned at the same time
+    MAX_CONCURRENT_CLONES: int = 4
+
     # File limits
     MAX_FILE_SIZE_BYTES: int = 500000
 
@@ -37,4 +49,4 @@ class Settings(BaseSettings):
 settings = Settings()
 
 # Ensure the temp directory exists
-settings.TEMP_REPO_DIR.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+settings.TEMP_REPO_DIR.mkdir(parents=True, exist_ok=True)
@@ -1,9 +1,13 @@
-from fastapi import FastAPI, BackgroundTasks, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, BackgroundTasks, HTTPException, Response
+from pydantic import BaseModel
 from starlette import status
 
 from app.config import settings
+from app.middleware import FastCORS
 from app.models import (
+    ensure_models_rebuilt,
     RepoRequest,
     AnalysisResponse,
     HealthResponse,
@@ -14,25 +18,51 @@ from app.models import (
 # MODIFIED: Import new services
 from app.services.analysis_service import (
     analyze_repository_basic,
-    analyze_repository_graph
+    analyze_repository_graph,
+    analyze_repository_dependencies
 )
 from app.utils.github_cloner import get_active_clones_count
+from app.parsers.javascript_parser import js_parser_pool
+from app.parsers.manager import shutdown_process_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # --- Startup ---
+    # Resolve recursive model forward refs once, outside import time
+    ensure_models_rebuilt()
+    yield
+    # --- Shutdown ---
+    # Stop the long-lived Node.js parser worker
+    await js_parser_pool.close()
+    # Stop the Python parser worker processes
+    shutdown_process_pool()
+
 
 app = FastAPI(
     title="AI-Powered Code Documentation Generator",
     description="Analyzes GitHub repos and generates documentation using AI.",
     version="0.2.0", # Bump version
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 # --- Middleware ---
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Allows any origin, method and header (with credentials)
+app.add_middleware(FastCORS)
+
+# --- Helpers ---
+
+def _model_response(model: BaseModel) -> Response:
+    """
+    Serializes an already-validated model straight to JSON.
+
+    Returning a Response bypasses FastAPI's response_model validation, which
+    would otherwise re-validate every GraphNode/GraphEdge/CodeElement the
+    service just built. response_model is kept on the route for OpenAPI docs.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
 
 # --- API Endpoints (Server) ---
 
@@ -64,7 +94,7 @@ async def post_analyze_basic(
     try:
         # Use the original Phase 1 service function
         response_data = await analyze_repository_basic(request, background_tasks)
-        return response_data
+        return _model_response(response_data)
     except HTTPException:
         raise
     except Exception as e:
@@ -95,7 +125,7 @@ async def post_analyze_graph(
     try:
         # Use the new Phase 2 service function
         response_data = await analyze_repository_graph(request, background_tasks)
-        return response_data
+        return _model_response(response_data)
     except HTTPException:
         raise
     except Exception as e:
@@ -122,9 +152,9 @@ async def post_analyze_dependencies(
     (most imported, cycles, etc.) without the full graph layout.
     """
     try:
-        # We can reuse the main service function and just return part of it
-        full_response = await analyze_repository_graph(request, background_tasks)
-        return full_response.dependencies
+        # Runs only the parse + dependency stages, no graph layout
+        response_data = await analyze_repository_dependencies(request, background_tasks)
+        return _model_response(response_data)
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,69 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Headers added to every CORS response. The app allows any origin, so the
+# request's Origin is echoed back (required when credentials are allowed).
+_CORS_HEADERS = [
+    (b"access-control-allow-credentials", b"true"),
+    (b"vary", b"Origin"),
+]
+
+# Extra headers for preflight (OPTIONS) responses
+_PREFLIGHT_HEADERS = _CORS_HEADERS + [
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-max-age", b"600"),
+    (b"content-type", b"text/plain; charset=utf-8"),
+    (b"content-length", b"2"),
+]
+
+
+class FastCORS:
+    """
+    Minimal ASGI CORS middleware for an allow-everything policy (any origin,
+    method and header, with credentials).
+
+    Behaves like Starlette's CORSMiddleware configured with "*" everywhere,
+    but skips its per-request header parsing and policy checks: headers are
+    precomputed and preflights are answered directly.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            # Not a cross-origin request
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            # Preflight: allow whatever was asked for
+            headers = [(b"access-control-allow-origin", origin), *_PREFLIGHT_HEADERS]
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b"OK"})
+            return
+
+        cors_headers = [(b"access-control-allow-origin", origin), *_CORS_HEADERS]
+
+        async def send_with_cors(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *cors_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
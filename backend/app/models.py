@@ -1,3 +1,5 @@
+from functools import cache
+
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Literal, Union
 
@@ -50,7 +52,18 @@ class FolderNode(BaseModel):
 
 # This allows FolderNode to recursively contain itself or FileNode
 RepositoryNode = Union[FileNode, FolderNode]
-FolderNode.model_rebuild()
+
+
+@cache
+def ensure_models_rebuilt() -> bool:
+    """
+    Resolves the FolderNode -> RepositoryNode forward reference.
+
+    Deferred out of import time and run once from app startup; Pydantic
+    would otherwise rebuild lazily on first validation.
+    """
+    FolderNode.model_rebuild()
+    return True
 
 
 # --- API Response Models ---
@@ -1,77 +1,165 @@
-import os
-from pathlib import Path
-from typing import List, Dict, Set, Tuple
-from collections import defaultdict, Counter
+import heapq
+import posixpath
+from array import array
+from typing import List, Dict, Tuple, Iterable
+from collections import defaultdict
 
 from app.models import FileNode, DependencyAnalysis, DependencyInfo, CircularDependency
 
 
-# ... (_resolve_relative_import and build_dependency_graph are unchanged) ...
-def _resolve_relative_import(
+# Suffixes tried, in order, when an import doesn't name an existing file.
+# Ordered by how often each one hits for the importing file's language.
+_PY_EXT = (".py", "/__init__.py")
+_JS_EXT = (".js", ".ts", ".jsx", ".tsx", "/index.js", "/index.ts")
+_TS_EXT = (".ts", ".tsx", ".js", ".jsx", "/index.ts", "/index.js")
+
+# Fallback for files whose language isn't known
+EXTENSIONS_TO_TRY = (
+    ".py", ".js", ".ts", ".jsx", ".tsx",
+    "/__init__.py", "/index.js", "/index.ts",
+)
+
+EXTENSIONS_BY_LANGUAGE: Dict[str, Tuple[str, ...]] = {
+    "python": _PY_EXT,
+    "javascript": _JS_EXT,
+    "typescript": _TS_EXT,
+}
+
+
+def _parent_dir(file_path: str) -> str:
+    """
+    Returns the parent directory of a repo-relative, forward-slash path
+    ("." for top-level files) without building a Path object.
+    """
+    return file_path.rpartition("/")[0] or "."
+
+
+def _resolve_import_path(
+        current_dir_str: str,
         import_path: str,
-        current_file: FileNode,
-        all_files: Dict[str, FileNode]
+        all_files: Dict[str, FileNode],
+        extensions: Tuple[str, ...] = EXTENSIONS_TO_TRY
 ) -> str | None:
-    current_dir = Path(current_file.path).parent
-    resolved_path_str = os.path.normpath(current_dir / import_path)
-    extensions_to_try = [
-        "", ".py", ".js", ".ts", ".jsx", ".tsx",
-        "/__init__.py", "/index.js", "/index.ts",
-    ]
+    """
+    Resolves a relative import against a directory, trying the bare path
+    first and then each candidate suffix in `extensions`.
+    """
+    # Paths are stored in forward-slash form, so posixpath is always correct
+    resolved_path_str = posixpath.normpath(current_dir_str + "/" + import_path)
     if resolved_path_str in all_files:
         return resolved_path_str
-    for ext in extensions_to_try:
-        path_with_ext = f"{resolved_path_str}{ext}".replace("\\", "/")
+    for ext in extensions:
+        path_with_ext = resolved_path_str + ext
         if path_with_ext in all_files:
             return path_with_ext
     return None
 
 
+def _resolve_relative_import(
+        import_path: str,
+        current_file: FileNode,
+        all_files: Dict[str, FileNode]
+) -> str | None:
+    return _resolve_import_path(
+        _parent_dir(current_file.path),
+        import_path,
+        all_files,
+        EXTENSIONS_BY_LANGUAGE.get(current_file.language, EXTENSIONS_TO_TRY),
+    )
+
+
+# Cache sentinel: None is a valid (unresolvable) cached result
+_UNRESOLVED = object()
+
+
 def build_dependency_graph(
         all_files: Dict[str, FileNode]
 ) -> Dict[str, List[str]]:
     graph = defaultdict(list)
+    # Sibling files often share imports, so each import is resolved once per
+    # (directory, language) per graph build. The cache is nested so the hot
+    # loop looks up plain import strings (whose hashes are cached) instead
+    # of building and hashing a tuple key per import.
+    resolved_cache: Dict[Tuple[str, str], Dict[str, str | None]] = {}
     for file_path, file_node in all_files.items():
+        current_dir = _parent_dir(file_node.path)
+        language = file_node.language
+        extensions = EXTENSIONS_BY_LANGUAGE.get(language, EXTENSIONS_TO_TRY)
+        dir_cache = resolved_cache.setdefault((current_dir, language), {})
         for import_path in file_node.imports:
             if not import_path.startswith("."):
                 continue
-            resolved = _resolve_relative_import(import_path, file_node, all_files)
-            if resolved and resolved in all_files:
+            resolved = dir_cache.get(import_path, _UNRESOLVED)
+            if resolved is _UNRESOLVED:
+                resolved = dir_cache[import_path] = _resolve_import_path(
+                    current_dir, import_path, all_files, extensions
+                )
+            if resolved:
                 graph[file_path].append(resolved)
     return graph
 
 
-# ... (analyze_dependencies is unchanged) ...
+def _index_graph(
+        graph: Dict[str, List[str]],
+        known_paths: Iterable[str] = ()
+) -> Tuple[List[str], List[List[int]]]:
+    """
+    Interns every path as an int id (known_paths first, then in the order
+    they appear in the graph) and returns (paths, adjacency), where
+    adjacency[i] holds the ids imported by paths[i].
+
+    Graph algorithms then index plain lists instead of re-hashing path
+    strings on every lookup; ids map back to paths only for the results.
+    """
+    paths: List[str] = list(known_paths)
+    id_of: Dict[str, int] = {path: i for i, path in enumerate(paths)}
+    adjacency: List[List[int]] = [[] for _ in paths]
+
+    def intern(path: str) -> int:
+        path_id = id_of.get(path)
+        if path_id is None:
+            path_id = id_of[path] = len(paths)
+            paths.append(path)
+            adjacency.append([])
+        return path_id
+
+    for source, dependencies in graph.items():
+        source_id = intern(source)
+        adjacency[source_id] = [intern(dependency) for dependency in dependencies]
+
+    return paths, adjacency
+
+
 def analyze_dependencies(
         all_files: Dict[str, FileNode],
         graph: Dict[str, List[str]]
 ) -> DependencyAnalysis:
-    imported_by_counter = Counter()
-    for dependencies in graph.values():
-        imported_by_counter.update(dependencies)
-
-    imports_counter = {}
-    isolated_files = []
-    all_file_paths = set(all_files.keys())
-    files_in_graph = set(graph.keys()) | set(imported_by_counter.keys())
-
-    for file_path in all_file_paths:
-        imports_count = len(graph.get(file_path, []))
-        imports_counter[file_path] = imports_count
-        imported_by_count = imported_by_counter.get(file_path, 0)
-        if imports_count == 0 and imported_by_count == 0 and file_path in all_file_paths:
-            isolated_files.append(file_path)
-
-    dep_info = [
-        DependencyInfo(
-            path=path,
-            imported_by_count=imported_by_counter.get(path, 0),
-            imports_count=imports_counter.get(path, 0)
-        ) for path in files_in_graph
-    ]
+    paths, adjacency = _index_graph(graph, all_files)
+
+    # Single pass over the edges builds the reverse (imported-by) counts
+    imported_by = array("i", [0]) * len(paths)
+    for dependency_ids in adjacency:
+        for dependency_id in dependency_ids:
+            imported_by[dependency_id] += 1
+
+    dep_info: List[DependencyInfo] = []
+    isolated_files: List[str] = []
+    for path_id, path in enumerate(paths):
+        imports_count = len(adjacency[path_id])
+        imported_by_count = imported_by[path_id]
+        if imports_count or imported_by_count:
+            dep_info.append(
+                DependencyInfo(
+                    path=path,
+                    imported_by_count=imported_by_count,
+                    imports_count=imports_count
+                )
+            )
+        else:
+            isolated_files.append(path)
 
-    most_imported = sorted(dep_info, key=lambda x: x.imported_by_count, reverse=True)[:10]
-    most_importing = sorted(dep_info, key=lambda x: x.imports_count, reverse=True)[:10]
+    most_imported = heapq.nlargest(10, dep_info, key=lambda x: x.imported_by_count)
+    most_importing = heapq.nlargest(10, dep_info, key=lambda x: x.imports_count)
 
     return DependencyAnalysis(
         most_imported=most_imported,
@@ -81,41 +169,105 @@ def analyze_dependencies(
     )
 
 
-# --- MODIFIED: This function is fixed ---
-def _find_cycles_dfs(
-        node: str,
-        graph: Dict[str, List[str]],
-        visited: Set[str],
-        # MODIFIED: Changed from Set[str] to List[str] to act as an ordered stack
-        recursion_stack: List[str],
-        all_cycles: Set[Tuple[str, ...]]
-):
+def _to_csr(adjacency: List[List[int]]) -> Tuple[array, array]:
+    """
+    Packs an adjacency list into compressed sparse row form: the neighbors
+    of node i are indices[indptr[i]:indptr[i + 1]].
+    """
+    indptr = array("i", [0])
+    indices = array("i")
+    extend = indices.extend
+    append_ptr = indptr.append
+    for neighbors in adjacency:
+        extend(neighbors)
+        append_ptr(len(indices))
+    return indptr, indices
+
+
+def _strongly_connected_components(indptr: array, indices: array) -> List[List[int]]:
     """
-    DFS helper to find cycles.
+    Iterative Tarjan's algorithm over a CSR graph.
+
+    Returns the SCCs in the order they are completed. Each frame on the
+    DFS stack is just a node id; its resume position is kept in a flat
+    per-node edge cursor, so no per-frame tuples or iterators are built.
     """
-    visited.add(node)
-    # MODIFIED: Use append
-    recursion_stack.append(node)
+    node_count = len(indptr) - 1
+
+    index_of = array("i", [-1]) * node_count
+    lowlink = array("i", [0]) * node_count
+    on_stack = bytearray(node_count)
+    # Next edge (position in indices) to explore for each node
+    edge_pos = indptr[:-1]
+    scc_stack: List[int] = []
+    sccs: List[List[int]] = []
+    next_index = 0
 
-    for neighbor in graph.get(node, []):
-        if neighbor not in visited:
-            _find_cycles_dfs(neighbor, graph, visited, recursion_stack, all_cycles)
-        elif neighbor in recursion_stack:
-            # Cycle detected!
-            try:
-                # MODIFIED: Find the start of the cycle in the ordered stack
-                start_index = recursion_stack.index(neighbor)
-                # The cycle is all nodes from the start_index to the end
-                cycle = tuple(sorted(recursion_stack[start_index:]))
-                all_cycles.add(cycle)
-            except ValueError:
-                pass  # Should not happen
+    # Bind hot methods to locals once; this loop runs per node and per edge
+    push_scc = scc_stack.append
+    pop_scc = scc_stack.pop
+    add_scc = sccs.append
 
-    # MODIFIED: Use pop
-    recursion_stack.pop()
+    for root in range(node_count):
+        if index_of[root] != -1:
+            continue
 
+        index_of[root] = lowlink[root] = next_index
+        next_index += 1
+        push_scc(root)
+        on_stack[root] = 1
+        call_stack: List[int] = [root]
+        push_frame = call_stack.append
+        pop_frame = call_stack.pop
 
-# --- END MODIFICATION ---
+        while call_stack:
+            node = call_stack[-1]
+            pos = edge_pos[node]
+            end = indptr[node + 1]
+            descended = False
+
+            while pos < end:
+                neighbor = indices[pos]
+                pos += 1
+                if index_of[neighbor] == -1:
+                    # Tree edge: "recurse" by pushing a new frame
+                    edge_pos[node] = pos
+                    index_of[neighbor] = lowlink[neighbor] = next_index
+                    next_index += 1
+                    push_scc(neighbor)
+                    on_stack[neighbor] = 1
+                    push_frame(neighbor)
+                    descended = True
+                    break
+                if on_stack[neighbor]:
+                    # Back edge into the current SCC
+                    neighbor_index = index_of[neighbor]
+                    if neighbor_index < lowlink[node]:
+                        lowlink[node] = neighbor_index
+
+            if descended:
+                continue
+
+            # All neighbors explored: "return" from this frame
+            edge_pos[node] = end
+            pop_frame()
+            if call_stack:
+                parent = call_stack[-1]
+                if lowlink[node] < lowlink[parent]:
+                    lowlink[parent] = lowlink[node]
+
+            if lowlink[node] == index_of[node]:
+                # node is the root of an SCC, peel it off the stack
+                scc: List[int] = []
+                while True:
+                    member = pop_scc()
+                    on_stack[member] = 0
+                    scc.append(member)
+                    if member == node:
+                        break
+                add_scc(scc)
+
+    return sccs
 
 
 def find_circular_dependencies(
@@ -123,15 +275,17 @@ def find_circular_dependencies(
 ) -> List[CircularDependency]:
     """
     Finds all circular dependencies (strongly connected components) in the graph
-    using Depth First Search (DFS).
-    """
-    visited = set()
-    recursion_stack: List[str] = []
-    all_cycles: Set[Tuple[str, ...]] = set()
+    using an iterative version of Tarjan's algorithm.
 
-    nodes = list(graph.keys())
-    for node in nodes:
-        if node not in visited:
-            _find_cycles_dfs(node, graph, visited, recursion_stack, all_cycles)
+    Every SCC with more than one file is reported as a cycle, as is any file
+    that imports itself. Runs in O(V + E) and never recurses, so deep import
+    chains cannot hit Python's recursion limit.
+    """
+    paths, adjacency = _index_graph(graph)
+    indptr, indices = _to_csr(adjacency)
 
-    return [CircularDependency(nodes=list(cycle)) for cycle in all_cycles]
\ No newline at end of file
+    return [
+        CircularDependency(nodes=[paths[member] for member in scc])
+        for scc in _strongly_connected_components(indptr, indices)
+        if len(scc) > 1 or scc[0] in indices[indptr[scc[0]]:indptr[scc[0] + 1]]
+    ]
@@ -1,21 +1,183 @@
 import asyncio
-import json
-import subprocess
+import orjson
 from pathlib import Path
 from typing import List, Tuple, Dict, Any
 
 from app.models import CodeElement
-from app.config import BASE_DIR
+from app.config import BASE_DIR, BASE_DIR_STR
 
 # Path to the Node.js parser script
 NODE_PARSER_SCRIPT = BASE_DIR/ "parsers" / "javascript_parser.js"
+NODE_PARSER_SCRIPT_STR = str(NODE_PARSER_SCRIPT)
+
+# Max size of a single JSON response line from the Node.js worker
+NODE_RESPONSE_LIMIT_BYTES = 32 * 1024 * 1024
+
+# How long a single parse request may wait for the worker's response
+NODE_RESPONSE_TIMEOUT_SECONDS = 60
+
+
+class JSParserPool:
+    """
+    Keeps a single long-lived Node.js parser process and multiplexes
+    parse requests over it using newline-delimited JSON on stdin/stdout.
+
+    This avoids paying Node startup + Babel load for every file. The worker
+    is started lazily and restarted if it exits or the event loop changes.
+    """
+
+    def __init__(self):
+        self._process: asyncio.subprocess.Process | None = None
+        self._reader_task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+
+    async def _ensure_started(self) -> asyncio.subprocess.Process:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A new event loop (e.g. a new test or server run): the old
+            # process and futures belong to the previous loop.
+            self._kill()
+            self._loop = loop
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            # A finished reader means the worker is dead even if its exit
+            # status hasn't been collected yet: nobody would answer requests
+            if (
+                    self._process is None
+                    or self._process.returncode is not None
+                    or self._reader_task is None
+                    or self._reader_task.done()
+            ):
+                self._process = await asyncio.create_subprocess_exec(
+                    "node", NODE_PARSER_SCRIPT_STR, "--server",
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    cwd=BASE_DIR_STR,  # Run from the 'backend' directory
+                    limit=NODE_RESPONSE_LIMIT_BYTES,
+                )
+                # Each worker gets its own pending map, so a dying reader
+                # only fails the requests that were sent to it.
+                self._pending = {}
+                self._reader_task = loop.create_task(
+                    self._read_responses(self._process, self._pending)
+                )
+            return self._process
+
+    async def _read_responses(
+            self,
+            process: asyncio.subprocess.Process,
+            pending: Dict[int, asyncio.Future]
+    ):
+        """
+        Background task that resolves pending futures as responses arrive.
+        """
+        try:
+            while True:
+                try:
+                    line = await process.stdout.readline()
+                except (ValueError, asyncio.LimitOverrunError) as e:
+                    print(f"Error reading response from Node.js parser: {e}")
+                    break
+                if not line:
+                    break
+                try:
+                    response = orjson.loads(line)
+                except orjson.JSONDecodeError as e:
+                    print(f"Error decoding JSON from Node.js parser: {e}")
+                    break
+
+                future = pending.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            # The worker is gone (or unusable): fail every in-flight request
+            # so callers don't hang, and let the next call start a new one.
+            if self._process is process:
+                self._process = None
+            if process.returncode is None:
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
+            process.stdin.close()
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(
+                        RuntimeError("Node.js parser process exited unexpectedly")
+                    )
+            pending.clear()
+
+    async def parse(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Sends one parse request to the worker and waits for its response.
+        """
+        process = await self._ensure_started()
+
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending
+        pending[request_id] = future
+
+        try:
+            request = {"id": request_id, "path": str(file_path)}
+            process.stdin.write(orjson.dumps(request) + b"\n")
+            await process.stdin.drain()
+
+            return await asyncio.wait_for(future, timeout=NODE_RESPONSE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            # The worker handles requests in order, so while it is stuck on
+            # this file every later request would time out too: replace it
+            if self._process is process:
+                self._kill()
+            raise
+        finally:
+            # Drop the entry if the write failed or the wait timed out
+            pending.pop(request_id, None)
+
+    def _kill(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        if self._process is not None and self._process.returncode is None:
+            try:
+                self._process.kill()
+            except (ProcessLookupError, RuntimeError):
+                pass  # Already exited, or its event loop is closed
+        self._process = None
+        self._reader_task = None
+        self._pending = {}
+
+    async def close(self):
+        """
+        Stops the worker process. Safe to call if it was never started.
+        """
+        process = self._process
+        if process is None:
+            return
+
+        if self._loop is asyncio.get_running_loop() and process.returncode is None:
+            # Closing stdin lets the worker finish and exit on its own
+            process.stdin.close()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                pass
+        self._kill()
+
+
+# Shared worker used by every parse_javascript_file call
+js_parser_pool = JSParserPool()
 
 
 async def parse_javascript_file(
         file_path: Path
 ) -> Tuple[List[CodeElement], List[str]]:
     """
-    Calls the Node.js Babel parser script as a subprocess.
+    Sends the file to the long-lived Node.js Babel parser worker.
 
     Returns a tuple of (code_elements, import_statements).
     """
@@ -25,22 +187,12 @@ async def parse_javascript_file(
         print(f"Error: Node parser script not found at {NODE_PARSER_SCRIPT}")
         return [], []
 
-    command = ["node", str(NODE_PARSER_SCRIPT), str(file_path)]
-
     try:
-        # Run the blocking subprocess in a separate thread
-        process = await asyncio.to_thread(
-            subprocess.run,
-            command,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            check=True,  # Raise error if exit code is non-zero
-            cwd=BASE_DIR  # Run from the 'backend' directory
-        )
-
-        # Parse the JSON output from stdout
-        result = json.loads(process.stdout)
+        result = await js_parser_pool.parse(file_path)
+
+        if "error" in result:
+            print(f"Error running Node.js parser on {file_path}: {result['error']}")
+            return [], []
 
         # Validate and convert elements to Pydantic models
         parsed_elements = [
@@ -50,14 +202,6 @@ async def parse_javascript_file(
 
         return parsed_elements, imports
 
-    except subprocess.CalledProcessError as e:
-        print(f"Error running Node.js parser on {file_path}:")
-        print(f"STDOUT: {e.stdout}")
-        print(f"STDERR: {e.stderr}")
-        return [], []
-    except json.JSONDecodeError as e:
-        print(f"Error decoding JSON from Node.js parser for {file_path}: {e}")
-        return [], []
     except Exception as e:
         print(f"Unexpected error parsing JS/TS file {file_path}: {e}")
-        return [], []
\ No newline at end of file
+        return [], []
@@ -1,11 +1,105 @@
 import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Tuple, Dict, Callable, Awaitable
 
+from app.config import settings
 from app.models import CodeElement
-from app.parsers.python_parser import parse_python_file
+from app.parsers.python_parser import (
+    parse_python_file,
+    parse_python_files,
+    prune_parse_cache,
+    to_code_elements,
+)
 from app.parsers.javascript_parser import parse_javascript_file
 
+# Python parsing is pure CPU work (ast.parse + tree walk), which threads
+# serialize under the GIL, so it runs in worker processes instead.
+# Created lazily on first use and shut down with the app.
+_PY_POOL: ProcessPoolExecutor | None = None
+
+# The pool is first created while other threads (e.g. the directory walker)
+# are running, and forking a multi-threaded process can deadlock the child,
+# so workers are started from a clean forkserver (spawn where unavailable).
+_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Upper bound on Python files handed to a worker process per submission
+PYTHON_BATCH_SIZE = 64
+
+# Tries per batch when a worker dies: the batch may have been caught up in
+# another batch's crash, so it gets one more go on a fresh pool
+PYTHON_BATCH_ATTEMPTS = 2
+
+# Expired parse cache entries are swept at most this often
+PARSE_CACHE_PRUNE_INTERVAL_SECONDS = 60 * 60
+_last_cache_prune: float | None = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _PY_POOL
+    if _PY_POOL is None:
+        _PY_POOL = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=_MP_CONTEXT)
+    return _PY_POOL
+
+
+def _discard_broken_pool(pool: ProcessPoolExecutor):
+    """
+    Drops a pool whose worker died (e.g. OOM-killed), so the next call
+    starts a fresh one instead of failing forever.
+    """
+    global _PY_POOL
+    if _PY_POOL is pool:
+        _PY_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _maybe_prune_parse_cache():
+    global _last_cache_prune
+    now = time.monotonic()
+    if _last_cache_prune is not None and now - _last_cache_prune < PARSE_CACHE_PRUNE_INTERVAL_SECONDS:
+        return
+    _last_cache_prune = now
+    # Directory scan and unlinks are I/O, keep them off the event loop
+    await asyncio.get_running_loop().run_in_executor(None, prune_parse_cache)
+
+
+def shutdown_process_pool():
+    """
+    Stops the Python parser worker processes, if they were started.
+    """
+    global _PY_POOL
+    if _PY_POOL is not None:
+        _PY_POOL.shutdown(cancel_futures=True)
+        _PY_POOL = None
+
+
+async def _parse_python(file_path: Path) -> Tuple[List[CodeElement], List[str]]:
+    # Python parser is synchronous and CPU-bound, run it in a worker process
+    pool = _get_process_pool()
+    try:
+        raw_elements, imports = await asyncio.get_running_loop().run_in_executor(
+            pool, parse_python_file, file_path
+        )
+    except BrokenProcessPool:
+        _discard_broken_pool(pool)
+        raise
+    return to_code_elements(raw_elements), imports
+
+
+# Language -> parser coroutine. The JS parser is already async (it talks to
+# the Node.js worker) and handles TypeScript too.
+_DISPATCH: Dict[str, Callable[[Path], Awaitable[Tuple[List[CodeElement], List[str]]]]] = {
+    "python": _parse_python,
+    "javascript": parse_javascript_file,
+    "typescript": parse_javascript_file,
+}
+
 
 async def parse_file(
         file_path: Path,
@@ -16,13 +110,79 @@ async def parse_file(
 
     Returns a tuple of (code_elements, import_statements).
     """
-    if language == "python":
-        # Python parser is synchronous, wrap in to_thread
-        return await asyncio.to_thread(parse_python_file, file_path)
+    parser = _DISPATCH.get(language)
+    if parser is None:
+        # Default for unknown but supported extensions
+        return [], []
+    return await parser(file_path)
+
+
+async def parse_files(
+        items: List[Tuple[Path, str]],
+        *,
+        concurrency: int | None = None,
+        semaphore: asyncio.Semaphore | None = None
+) -> List[Tuple[List[CodeElement], List[str]] | None]:
+    """
+    Parses many (file_path, language) pairs concurrently.
+
+    Python files are grouped into batches of up to PYTHON_BATCH_SIZE and
+    each batch is one process pool submission; other files are parsed one
+    by one. A semaphore caps how many jobs are in flight at once (default
+    2 x CPU count) so large repos don't flood the Node.js worker and the
+    process pool. Pass `semaphore` to share that cap between concurrent
+    parse_files calls. Results are returned in the same order as items; a
+    file that fails to parse yields None.
+    """
+    cpu_count = os.cpu_count() or 1
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(concurrency or cpu_count * 2)
+    results: List[Tuple[List[CodeElement], List[str]] | None] = [None] * len(items)
+
+    async def _parse_one(index: int, file_path: Path, language: str):
+        async with semaphore:
+            try:
+                results[index] = await parse_file(file_path, language)
+            except Exception as e:
+                print(f"Failed to parse {file_path}: {e}")
+
+    async def _parse_python_batch(indices: List[int]):
+        file_paths = [items[index][0] for index in indices]
+        async with semaphore:
+            for attempt in range(1, PYTHON_BATCH_ATTEMPTS + 1):
+                pool = _get_process_pool()
+                try:
+                    batch = await asyncio.get_running_loop().run_in_executor(
+                        pool, parse_python_files, file_paths
+                    )
+                    break
+                except BrokenProcessPool as e:
+                    print(f"Python parser worker died (attempt {attempt}), restarting the pool: {e}")
+                    _discard_broken_pool(pool)
+                except Exception as e:
+                    print(f"Failed to parse batch of {len(file_paths)} Python files: {e}")
+                    return
+            else:
+                print(f"Giving up on batch of {len(file_paths)} Python files")
+                return
+        for index, (raw_elements, imports) in zip(indices, batch):
+            results[index] = (to_code_elements(raw_elements), imports)
+
+    jobs = []
+    python_indices: List[int] = []
+    for index, (file_path, language) in enumerate(items):
+        if language == "python":
+            python_indices.append(index)
+        else:
+            jobs.append(_parse_one(index, file_path, language))
+
+    if python_indices and settings.PARSE_CACHE_ENABLED:
+        await _maybe_prune_parse_cache()
 
-    if language in ("javascript", "typescript"):
-        # JS parser is already async (it wraps a subprocess)
-        return await parse_javascript_file(file_path)
+    # Small repos still get spread over every worker
+    batch_size = max(1, min(PYTHON_BATCH_SIZE, -(-len(python_indices) // cpu_count)))
+    for start in range(0, len(python_indices), batch_size):
+        jobs.append(_parse_python_batch(python_indices[start:start + batch_size]))
 
-    # Default for unknown but supported extensions
-    return [], []
\ No newline at end of file
+    await asyncio.gather(*jobs)
+    return results
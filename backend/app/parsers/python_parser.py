@@ -1,15 +1,100 @@
 import ast
+import hashlib
+import os
+import pickle
+import sys
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Tuple
 
+from app.config import settings
 from app.models import CodeElement
 
 
-# ... (Helper functions _get_docstring, _get_function_details, _get_class_details remain the same) ...
+@dataclass(slots=True)
+class RawCodeElement:
+    """
+    Lightweight, unvalidated counterpart of CodeElement used while walking
+    the AST. Converted to CodeElement once via to_code_elements().
+    """
+    type: str
+    name: str
+    start_line: int
+    end_line: int
+    docstring: str | None = None
+    parameters: List[str] = field(default_factory=list)
+    return_type: str | None = None
+    base_classes: List[str] = field(default_factory=list)
+
+
+def to_code_elements(raw_elements: List[RawCodeElement]) -> List[CodeElement]:
+    """
+    Converts parser output to CodeElement models, once per file.
+
+    Uses the normal (validating) constructor: with pydantic-core it is
+    faster than model_construct, whose field handling runs in Python.
+    """
+    return [
+        CodeElement(
+            type=raw.type,
+            name=raw.name,
+            start_line=raw.start_line,
+            end_line=raw.end_line,
+            docstring=raw.docstring,
+            parameters=raw.parameters,
+            return_type=raw.return_type,
+            base_classes=raw.base_classes,
+        )
+        for raw in raw_elements
+    ]
+
+
 def _get_docstring(node: ast.AsyncFunctionDef | ast.FunctionDef | ast.ClassDef) -> str | None:
     return ast.get_docstring(node)
 
 
+# Annotation nodes that never need parentheses around them
+_ANNOTATION_ATOMS = (ast.Name, ast.Attribute, ast.Subscript, ast.Constant)
+
+
+def _annotation_to_str(node: ast.expr) -> str:
+    """
+    Formats the common annotation shapes (names, dotted names, subscripts,
+    literals, X | Y unions, [A, B] lists) directly, falling back to the
+    much slower ast.unparse for anything else. Output matches ast.unparse
+    for the handled shapes.
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute) and isinstance(node.value, (ast.Name, ast.Attribute)):
+        return f"{_annotation_to_str(node.value)}.{node.attr}"
+    if isinstance(node, ast.Subscript) and isinstance(node.value, _ANNOTATION_ATOMS):
+        slice_node = node.slice
+        if isinstance(slice_node, ast.Tuple):
+            if len(slice_node.elts) < 2:
+                return ast.unparse(node)  # e.g. tuple[()] or tuple[int,]
+            inner = ", ".join(_annotation_to_str(elt) for elt in slice_node.elts)
+        else:
+            inner = _annotation_to_str(slice_node)
+        return f"{_annotation_to_str(node.value)}[{inner}]"
+    if isinstance(node, ast.Constant) and node.value is not Ellipsis:
+        return repr(node.value)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        # X | Y unions. "|" is left-associative, so only the left side may
+        # itself be a union without needing parentheses.
+        left, right = node.left, node.right
+        if isinstance(right, _ANNOTATION_ATOMS) and (
+                isinstance(left, _ANNOTATION_ATOMS)
+                or (isinstance(left, ast.BinOp) and isinstance(left.op, ast.BitOr))
+        ):
+            return f"{_annotation_to_str(left)} | {_annotation_to_str(right)}"
+    if isinstance(node, ast.List):
+        # Parameter lists, e.g. the [int, str] in Callable[[int, str], None]
+        return "[" + ", ".join(_annotation_to_str(elt) for elt in node.elts) + "]"
+    return ast.unparse(node)
+
+
 def _get_function_details(
         node: ast.AsyncFunctionDef | ast.FunctionDef
 ) -> Tuple[List[str], str | None]:
@@ -21,24 +106,21 @@ def _get_function_details(
         elif isinstance(node.returns, ast.Constant):
             return_type = str(node.returns.value)
         else:
-            return_type = ast.unparse(node.returns)
+            return_type = _annotation_to_str(node.returns)
     return params, return_type
 
 
-def _get_class_details(node: ast.ClassDef) -> Tuple[List[str], List[CodeElement]]:
+def _get_class_details(node: ast.ClassDef) -> Tuple[List[str], List[RawCodeElement]]:
     base_classes = []
     for base in node.bases:
-        if isinstance(base, ast.Name):
-            base_classes.append(base.id)
-        else:
-            base_classes.append(ast.unparse(base))
+        base_classes.append(_annotation_to_str(base))
 
     methods = []
     for body_item in node.body:
         if isinstance(body_item, (ast.FunctionDef, ast.AsyncFunctionDef)):
             method_params, method_return = _get_function_details(body_item)
             methods.append(
-                CodeElement(
+                RawCodeElement(
                     type="method",
                     name=body_item.name,
                     start_line=body_item.lineno,
@@ -54,112 +136,220 @@ def _get_class_details(node: ast.ClassDef) -> Tuple[List[str], List[CodeElement]
 # ... (End of unchanged helper functions) ...
 
 
-class PythonASTVisitor(ast.NodeVisitor):
+# Nodes that can contain statements (and so definitions or imports)
+_STATEMENT_NODES = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+def _function_element(node: ast.FunctionDef | ast.AsyncFunctionDef) -> RawCodeElement:
+    params, return_type = _get_function_details(node)
+    return RawCodeElement(
+        type="function",
+        name=node.name,
+        start_line=node.lineno,
+        end_line=node.end_lineno or node.lineno,
+        docstring=_get_docstring(node),
+        parameters=params,
+        return_type=return_type,
+    )
+
+
+def _class_element(node: ast.ClassDef) -> Tuple[RawCodeElement, List[RawCodeElement]]:
+    base_classes, methods = _get_class_details(node)
+    class_element = RawCodeElement(
+        type="class",
+        name=node.name,
+        start_line=node.lineno,
+        end_line=node.end_lineno or node.lineno,
+        docstring=_get_docstring(node),
+        base_classes=base_classes,
+    )
+    return class_element, methods
+
+
+def _import_from_path(node: ast.ImportFrom) -> str:
     """
-    Visits an AST tree and extracts function/class definitions and imports.
+    Handles `from pathlib import Path` or `from . import utils`
     """
+    # level 0: from my_pkg import foo
+    # level 1: from . import foo
+    # level 2: from .. import foo
+    prefix = "." * node.level
+    if node.module:
+        # Reconstruct the full import path
+        return f"{prefix}{node.module}"
+    # Handle `from . import foo` (where module is None). We can't know the
+    # full path here, but the dependency analyzer will use the prefix. For
+    # simplicity, we just add the prefix and the first imported name as a hint.
+    if node.names:
+        return f"{prefix}{node.names[0].name}"
+    return prefix
 
-    def __init__(self):
-        self.elements: List[CodeElement] = []
-        # --- NEW: Store imports ---
-        self.imports: List[str] = []
-        # --- END NEW ---
 
-    def visit_FunctionDef(self, node: ast.FunctionDef):
-        self._process_function(node)
-        # We don't call generic_visit to avoid parsing nested functions
-        # self.generic_visit(node)
+def _collect_definitions(tree: ast.Module) -> Tuple[List[RawCodeElement], List[str]]:
+    """
+    Extracts function/class definitions and imports from a module.
 
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
-        self._process_function(node)
-        # self.generic_visit(node)
+    Loops over module-level statements directly rather than visiting every
+    node. Descends into compound statements (if/try/with/...) so e.g.
+    guarded imports are still found, but never into function or class
+    bodies; methods are picked up by _get_class_details.
+    """
+    elements: List[RawCodeElement] = []
+    imports: List[str] = []
 
-    def _process_function(self, node: ast.FunctionDef | ast.AsyncFunctionDef):
-        # This simple check assumes top-level functions are not nested.
-        # A more robust way tracks parent nodes, but this is fine for now.
-        params, return_type = _get_function_details(node)
-        self.elements.append(
-            CodeElement(
-                type="function",
-                name=node.name,
-                start_line=node.lineno,
-                end_line=node.end_lineno or node.lineno,
-                docstring=_get_docstring(node),
-                parameters=params,
-                return_type=return_type,
-            )
-        )
+    stack = list(reversed(tree.body))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            # Nested functions are not parsed
+            elements.append(_function_element(node))
+        elif isinstance(node, ast.ClassDef):
+            class_element, methods = _class_element(node)
+            elements.append(class_element)
+            elements.extend(methods)
+        elif isinstance(node, ast.Import):
+            # `import os, sys`
+            imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imports.append(_import_from_path(node))
+        else:
+            # Keep source order when pushing nested statements
+            stack.extend(reversed([
+                child for child in ast.iter_child_nodes(node)
+                if isinstance(child, _STATEMENT_NODES)
+            ]))
 
-    def visit_ClassDef(self, node: ast.ClassDef):
-        base_classes, methods = _get_class_details(node)
+    return elements, imports
 
-        class_element = CodeElement(
-            type="class",
-            name=node.name,
-            start_line=node.lineno,
-            end_line=node.end_lineno or node.lineno,
-            docstring=_get_docstring(node),
-            base_classes=base_classes,
-        )
-        self.elements.append(class_element)
-        self.elements.extend(methods)
-        # Don't call generic_visit, methods are handled in _get_class_details
-
-    # --- NEW: Added import visitors ---
-    def visit_Import(self, node: ast.Import):
-        """
-        Handles `import os, sys`
-        """
-        for alias in node.names:
-            self.imports.append(alias.name)
-        self.generic_visit(node)
-
-    def visit_ImportFrom(self, node: ast.ImportFrom):
-        """
-        Handles `from pathlib import Path` or `from . import utils`
-        """
-        if node.module:
-            # Reconstruct the full import path
-            # level 0: from my_pkg import foo
-            # level 1: from . import foo
-            # level 2: from .. import foo
-            prefix = "." * node.level
-            self.imports.append(f"{prefix}{node.module}")
-        elif node.level > 0:
-            # Handle `from . import foo` (where module is None)
-            prefix = "." * node.level
-            # We can't know the full path here, but the dependency analyzer
-            # will use the prefix. For simplicity, we just add the prefix
-            # and the first imported name as a hint.
-            if node.names:
-                self.imports.append(f"{prefix}{node.names[0].name}")
-            else:
-                self.imports.append(f"{prefix}")
-
-        self.generic_visit(node)
-    # --- END NEW ---
-
-
-def parse_python_file(file_path: Path) -> Tuple[List[CodeElement], List[str]]:
+
+# Mixed into every cache key: a hash of this module's source, so any parser
+# change invalidates old entries without a manual version bump, plus the
+# interpreter version, because ast output differs across Python releases.
+_PARSE_CACHE_SALT = hashlib.blake2b(
+    Path(__file__).read_bytes()
+    + f":{sys.version_info[0]}.{sys.version_info[1]}".encode(),
+    digest_size=16,
+).digest()
+
+
+def _parse_cache_path(content: bytes) -> str:
+    """
+    Returns the cache file path for a file's contents. Entries are keyed on
+    a content hash, not the file path, so identical files share an entry
+    across analyses and clones.
+    """
+    key = hashlib.blake2b(_PARSE_CACHE_SALT + content, digest_size=16).hexdigest()
+    # Shard by the first two hex digits to keep directories small
+    return os.path.join(str(settings.PARSE_CACHE_DIR), key[:2], key)
+
+
+def _load_cached_parse(cache_path: str) -> Tuple[List[RawCodeElement], List[str]] | None:
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # Corrupt or incompatible entry: ignore it and re-parse
+        print(f"Ignoring unreadable parse cache entry {cache_path}: {e}")
+        return None
+
+
+def _store_cached_parse(
+        cache_path: str,
+        result: Tuple[List[RawCodeElement], List[str]]
+):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Write to a temp file and rename, so concurrent workers never see
+        # a partially written entry
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not write parse cache entry {cache_path}: {e}")
+
+
+def prune_parse_cache() -> int:
+    """
+    Deletes parse cache entries (and temp files left by interrupted writes)
+    older than PARSE_CACHE_MAX_AGE_SECONDS. Returns how many were removed.
+    """
+    cutoff = time.time() - settings.PARSE_CACHE_MAX_AGE_SECONDS
+    removed = 0
+    try:
+        shards = os.scandir(settings.PARSE_CACHE_DIR)
+    except OSError:
+        return 0  # No cache yet
+
+    with shards:
+        for shard in shards:
+            try:
+                if not shard.is_dir():
+                    continue
+                entries = list(os.scandir(shard.path))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        removed += 1
+                except OSError:
+                    pass  # Removed concurrently
+    return removed
+
+
+def parse_python_file(file_path: Path) -> Tuple[List[RawCodeElement], List[str]]:
     """
     Reads a Python file and uses AST to parse its structure and imports.
 
-    Returns a tuple of (code_elements, import_statements).
+    Returns a tuple of (raw_code_elements, import_statements). Use
+    to_code_elements() to turn the elements into CodeElement models.
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
+        # ast.parse accepts bytes and handles the encoding declaration/BOM
+        # itself, so skip the text-mode decode pass
+        with open(file_path, "rb") as f:
+            # Reject huge (vendored/generated) files before reading them;
+            # fstat on the open file saves a second path lookup
+            file_size = os.fstat(f.fileno()).st_size
+            if file_size > settings.MAX_FILE_SIZE_BYTES:
+                print(f"Skipping large file: {file_path} ({file_size} bytes)")
+                return [], []
             content = f.read()
 
-        tree = ast.parse(content)
-        visitor = PythonASTVisitor()
-        visitor.visit(tree)
-        # --- MODIFIED: Return imports as well ---
-        return visitor.elements, visitor.imports
-        # --- END MODIFICATION ---
+        cache_path = None
+        if settings.PARSE_CACHE_ENABLED:
+            cache_path = _parse_cache_path(content)
+            cached = _load_cached_parse(cache_path)
+            if cached is not None:
+                return cached
+
+        # Same as ast.parse, minus its Python-level wrapper; dont_inherit
+        # keeps this module's __future__ flags out of the compile
+        tree = compile(content, str(file_path), "exec", ast.PyCF_ONLY_AST, dont_inherit=True)
+        result = _collect_definitions(tree)
+
+        if cache_path is not None:
+            _store_cached_parse(cache_path, result)
+
+        return result
 
     except SyntaxError as e:
         print(f"Syntax error in {file_path} at line {e.lineno}: {e.msg}")
         return [], []
     except Exception as e:
         print(f"Error parsing Python file {file_path}: {e}")
-        return [], []
\ No newline at end of file
+        return [], []
+
+
+def parse_python_files(file_paths: List[Path]) -> List[Tuple[List[RawCodeElement], List[str]]]:
+    """
+    Parses a batch of Python files in one call, in order.
+
+    Lets a worker process take a whole chunk of files per submission, so
+    scheduling and pickling overhead is paid per batch instead of per file.
+    """
+    return [parse_python_file(file_path) for file_path in file_paths]
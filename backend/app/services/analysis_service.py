@@ -1,11 +1,12 @@
 import asyncio
+import os
 from pathlib import Path
 from typing import List, Dict, Tuple
 from fastapi import BackgroundTasks
-import dagre_py
 from app.models import (
     RepoRequest,
     AnalysisResponse,
+    CodeElement,
     FileNode,
     FolderNode,
     RepositoryNode,
@@ -15,10 +16,14 @@ from app.models import (
     DependencyAnalysis,
     CircularDependency
 )
-from app.parsers.python_parser import parse_python_file
 from app.utils.github_cloner import clone_repo
-from app.utils.file_walker import walk_directory, get_language_from_extension
-from app.parsers.manager import parse_file
+from app.utils.file_walker import (
+    walk_directory,
+    iter_directory,
+    get_language_from_extension,
+)
+from app.utils.graph_layout import layered_layout
+from app.parsers.manager import parse_files
 from app.parsers.dependency_analyzer import (
     build_dependency_graph,
     analyze_dependencies,
@@ -26,47 +31,106 @@ from app.parsers.dependency_analyzer import (
 )
 
 
+# Number of walked files handed to the parsers at a time
+WALK_BATCH_SIZE = 256
+
+
+async def _walk_and_parse(repo_path: Path) -> Dict[str, FileNode]:
+    """
+    Walks the repo in a worker thread and parses the files batch by batch
+    while the walk is still running, so discovery and parsing overlap
+    instead of parsing waiting for the complete file list.
+
+    Each batch is parsed as its own task and all of them are awaited at the
+    end, so one slow file doesn't hold up the next batch and Python and
+    JS/TS batches keep overlapping. They share one semaphore, which caps
+    in-flight parse jobs across batches like a single parse_files call.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[List[Tuple[Path, int]] | None] = asyncio.Queue()
+
+    def produce():
+        batch: List[Tuple[Path, int]] = []
+        try:
+            for entry in iter_directory(repo_path):
+                batch.append(entry)
+                if len(batch) == WALK_BATCH_SIZE:
+                    loop.call_soon_threadsafe(queue.put_nowait, batch)
+                    batch = []
+            if batch:
+                loop.call_soon_threadsafe(queue.put_nowait, batch)
+        finally:
+            # Always wake the consumer, even if the walk failed
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    producer = asyncio.create_task(asyncio.to_thread(produce))
+
+    semaphore = asyncio.Semaphore((os.cpu_count() or 1) * 2)
+    parse_tasks: List[asyncio.Task] = []
+    try:
+        while (batch := await queue.get()) is not None:
+            parse_tasks.append(asyncio.create_task(
+                _parse_all_files(repo_path, batch, semaphore=semaphore)
+            ))
+        await producer  # Re-raises any error from the walk
+        batch_results = await asyncio.gather(*parse_tasks)
+    except BaseException:
+        for task in parse_tasks:
+            task.cancel()
+        raise
+
+    file_nodes: Dict[str, FileNode] = {}
+    for batch_nodes in batch_results:
+        file_nodes.update(batch_nodes)
+    return file_nodes
+
+
 async def _parse_all_files(
         repo_path: Path,
-        file_paths: List[Path]
+        files: List[Tuple[Path, int]],
+        semaphore: asyncio.Semaphore | None = None
 ) -> Dict[str, FileNode]:
     """
     Parses all files concurrently using the parser manager.
+
+    `files` holds (path, size) pairs as returned by walk_directory.
     """
     file_nodes: Dict[str, FileNode] = {}
-    tasks = []
-
-    for file_path in file_paths:
-        language = get_language_from_extension(file_path.suffix)
-        tasks.append(
-            _parse_single_file(repo_path, file_path, language)
-        )
+    items = [
+        (file_path, get_language_from_extension(file_path.suffix))
+        for file_path, _ in files
+    ]
 
-    results = await asyncio.gather(*tasks)
+    results = await parse_files(items, semaphore=semaphore)
 
-    for result in results:
-        if result:
-            file_nodes[result.path] = result
+    for (file_path, language), (_, size), result in zip(items, files, results):
+        if result is None:
+            continue
+        file_node = _build_file_node(repo_path, file_path, language, size, *result)
+        if file_node:
+            file_nodes[file_node.path] = file_node
 
     return file_nodes
 
 
-async def _parse_single_file(
+def _build_file_node(
         repo_path: Path,
         file_path: Path,
-        language: str
+        language: str,
+        size: int,
+        elements: List[CodeElement],
+        imports: List[str]
 ) -> FileNode | None:
     """
-    Helper coroutine for parsing a single file.
+    Helper for wrapping a single file's parse result in a FileNode.
     """
     try:
         relative_path_str = str(file_path.relative_to(repo_path)).replace("\\", "/")
-        elements, imports = await parse_file(file_path, language)
 
         return FileNode(
             path=relative_path_str,
             language=language,
-            size=file_path.stat().st_size,
+            size=size,
             elements=elements,
             imports=imports,
         )
@@ -83,70 +147,35 @@ def build_file_tree(
     Converts a flat dict of file nodes into a nested FolderNode tree.
     """
     root = FolderNode(path=".")
-    folder_map: Dict[str, FolderNode] = {".": root}
 
-    sorted_paths = sorted(file_nodes.keys())
+    # Folders along the previous file's directory, root first, and their
+    # names. Sorted paths keep each folder's files contiguous, so a file
+    # only needs new folders past the prefix it shares with the last one.
+    folder_stack: List[FolderNode] = [root]
+    folder_names: List[str] = []
 
-    for file_path_str in sorted_paths:
-        file_node = file_nodes[file_path_str]
-        parts = file_path_str.split("/")
+    for file_path_str in sorted(file_nodes.keys()):
+        dir_parts = file_path_str.split("/")[:-1]
 
-        current_parent_folder_node = root
-        current_path_str = "."
+        common = 0
+        limit = min(len(dir_parts), len(folder_names))
+        while common < limit and folder_names[common] == dir_parts[common]:
+            common += 1
+        del folder_stack[common + 1:]
+        del folder_names[common:]
 
-        for part in parts[:-1]:  # Iterate through folders
-            if current_path_str == ".":
-                current_path_str = part
-            else:
-                current_path_str = f"{current_path_str}/{part}"
+        for part in dir_parts[common:]:
+            parent = folder_stack[-1]
+            new_folder = FolderNode(path=part if parent is root else f"{parent.path}/{part}")
+            parent.children.append(new_folder)
+            folder_stack.append(new_folder)
+            folder_names.append(part)
 
-            if current_path_str not in folder_map:
-                new_folder = FolderNode(path=current_path_str)
-                folder_map[current_path_str] = new_folder
-                current_parent_folder_node.children.append(new_folder)
-                current_parent_folder_node = new_folder
-            else:
-                current_parent_folder_node = folder_map[current_path_str]
-
-        current_parent_folder_node.children.append(file_node)
+        folder_stack[-1].children.append(file_nodes[file_path_str])
 
     return root
 
 
-def _layout_graph_with_dagre(
-        nodes: List[GraphNode],
-        edges: List[GraphEdge]
-) -> List[GraphNode]:
-    """
-    Uses Dagre to calculate node positions for auto-layout.
-    """
-    g = dagre_py.Dagre()
-    g.set_graph_options(rankdir='TB', nodesep=50, ranksep=100)  # Top-to-Bottom
-
-    # Add nodes to Dagre
-    for node in nodes:
-        g.add_node(
-            node.id,
-            label=node.data.get('label', ''),
-            width=250,  # Set a default width
-            height=50  # Set a default height
-        )
-
-    # Add edges to Dagre
-    for edge in edges:
-        g.add_edge(edge.source, edge.target)
-
-    # Run layout
-    g.layout()
-
-    # Update node positions
-    for node in nodes:
-        layout_node = g.get_node(node.id)
-        node.position = {"x": layout_node.x, "y": layout_node.y}
-
-    return nodes
-
-
 def _build_react_flow_graph(
         all_files: Dict[str, FileNode],
         graph: Dict[str, List[str]],
@@ -154,94 +183,118 @@ def _build_react_flow_graph(
 ) -> Tuple[List[GraphNode], List[GraphEdge]]:
     """
     Converts the adjacency list graph into React Flow nodes and edges.
-    """
-    nodes: List[GraphNode] = []
-    edges: List[GraphEdge] = []
 
-    # Create a set of all nodes in cycles for quick lookup
-    nodes_in_cycle = {
-        node for cycle in circular_deps for node in cycle.nodes
+    Layout runs on plain (source, target) pairs before the nodes exist, so
+    each GraphNode is built once with its final position.
+    """
+    # Map every node in a cycle to the index of its cycle (SCC). An edge is
+    # part of a cycle only if both ends are in the *same* SCC; two files in
+    # different cycles can import each other one-way without being circular.
+    cycle_of: Dict[str, int] = {
+        node: cycle_id
+        for cycle_id, cycle in enumerate(circular_deps)
+        for node in cycle.nodes
     }
 
-    # 1. Create nodes
-    for file_path, file_node in all_files.items():
-        node_type = "custom"
-        if file_path in nodes_in_cycle:
-            # This data will be used by the frontend
-            node_type = "customError"
-
-        nodes.append(
-            GraphNode(
-                id=file_path,
-                type=node_type,
-                data={"label": file_path, "language": file_node.language},
-                position={"x": 0, "y": 0}  # Dagre will overwrite this
-            )
-        )
-
-    # 2. Create edges
+    # 1. Create edges
+    edges: List[GraphEdge] = []
     for source_file, dependencies in graph.items():
-        for target_file in dependencies:
-            is_circular = (
-                    source_file in nodes_in_cycle and target_file in nodes_in_cycle
+        source_cycle = cycle_of.get(source_file)
+        edges.extend(
+            GraphEdge(
+                id=f"{source_file}__TO__{target_file}",
+                source=source_file,
+                target=target_file,
+                animated=False,
+                # Add red styling for circular dependencies
+                style=(
+                    {"stroke": "red"}
+                    if source_cycle is not None and cycle_of.get(target_file) == source_cycle
+                    else None
+                ),
             )
+            for target_file in dependencies
+        )
 
-            edges.append(
-                GraphEdge(
-                    id=f"{source_file}__TO__{target_file}",
-                    source=source_file,
-                    target=target_file,
-                    animated=False,
-                    # Add red styling for circular dependencies
-                    style={"stroke": "red"} if is_circular else None
-                )
-            )
+    # 2. Apply automatic layout (top-to-bottom layers)
+    positions = layered_layout(
+        list(all_files),
+        [(edge.source, edge.target) for edge in edges],
+    )
 
-    # 3. Apply automatic layout
-    nodes = _layout_graph_with_dagre(nodes, edges)
+    # 3. Create nodes; "customError" marks files in a cycle for the frontend
+    nodes: List[GraphNode] = [
+        GraphNode(
+            id=file_path,
+            type="customError" if file_path in cycle_of else "custom",
+            data={"label": file_path, "language": file_node.language},
+            position={"x": positions[file_path][0], "y": positions[file_path][1]},
+        )
+        for file_path, file_node in all_files.items()
+    ]
 
     return nodes, edges
 
 
-# --- MODIFIED: This is now the main service function for Phase 2 ---
-async def analyze_repository_graph(
+async def _parse_and_graph(
         request: RepoRequest,
         background_tasks: BackgroundTasks
-) -> GraphAnalysisResponse:
+) -> Tuple[Path, Dict[str, FileNode], Dict[str, List[str]]]:
     """
-    Orchestrates the FULL analysis of a GitHub repository for Phase 2.
+    Shared first stage of the Phase 2 analyses:
     1. Clones the repo
     2. Walks the file system
-    3. Parses all files concurrently
-    4. Builds the file hierarchy
-    5. Builds the dependency graph
-    6. Analyzes dependencies (most imported, cycles, etc.)
-    7. Generates the React Flow graph structure
+    3. Parses all files concurrently, overlapping with the walk
+    4. Builds the dependency graph
+
+    Returns (repo_path, all_files, dep_graph).
     """
     repo_path = await clone_repo(request.url, background_tasks)
 
-    # 1. Walk directory
-    file_paths = walk_directory(repo_path)
+    # 1-2. Walk directory and parse files as they are found
+    all_files: Dict[str, FileNode] = await _walk_and_parse(repo_path)
 
-    # 2. Parse all files
-    all_files: Dict[str, FileNode] = await _parse_all_files(repo_path, file_paths)
+    # 3. Build dependency graph
+    dep_graph = build_dependency_graph(all_files)
 
-    # 3. Build file hierarchy
-    hierarchy = build_file_tree(repo_path, all_files)
+    return repo_path, all_files, dep_graph
 
-    # 4. Build dependency graph
-    dep_graph = build_dependency_graph(all_files)
 
-    # 5. Analyze dependencies
+def _analyze_graph(
+        all_files: Dict[str, FileNode],
+        dep_graph: Dict[str, List[str]]
+) -> DependencyAnalysis:
+    """
+    Computes dependency statistics (most imported, cycles, etc.).
+    """
     dep_analysis = analyze_dependencies(all_files, dep_graph)
+    dep_analysis.circular_dependencies = find_circular_dependencies(dep_graph)
+    return dep_analysis
+
+
+# --- MODIFIED: This is now the main service function for Phase 2 ---
+async def analyze_repository_graph(
+        request: RepoRequest,
+        background_tasks: BackgroundTasks
+) -> GraphAnalysisResponse:
+    """
+    Orchestrates the FULL analysis of a GitHub repository for Phase 2.
+    1. Clones, walks, parses, and builds the dependency graph
+    2. Analyzes dependencies (most imported, cycles, etc.)
+    3. Builds the file hierarchy
+    4. Generates the React Flow graph structure
+    """
+    repo_path, all_files, dep_graph = await _parse_and_graph(request, background_tasks)
 
-    # 6. Find circular dependencies
-    cycles = find_circular_dependencies(dep_graph)
-    dep_analysis.circular_dependencies = cycles
+    # 1. Analyze dependencies
+    dep_analysis = _analyze_graph(all_files, dep_graph)
 
-    # 7. Generate React Flow graph
+    # 2. Build file hierarchy
+    hierarchy = build_file_tree(repo_path, all_files)
+
+    # 3. Generate React Flow graph
     graph_nodes, graph_edges = _build_react_flow_graph(
-        all_files, dep_graph, cycles
+        all_files, dep_graph, dep_analysis.circular_dependencies
     )
 
     return GraphAnalysisResponse(
@@ -252,6 +305,20 @@ async def analyze_repository_graph(
     )
 
 
+async def analyze_repository_dependencies(
+        request: RepoRequest,
+        background_tasks: BackgroundTasks
+) -> DependencyAnalysis:
+    """
+    Orchestrates a dependency-only analysis of a GitHub repository.
+
+    Same as analyze_repository_graph but skips the file hierarchy, React
+    Flow graph, and layout, which the statistics don't need.
+    """
+    _, all_files, dep_graph = await _parse_and_graph(request, background_tasks)
+    return _analyze_graph(all_files, dep_graph)
+
+
 # --- This is the original Phase 1 function, kept for the /analyze endpoint ---
 async def analyze_repository_basic(
         request: RepoRequest,
@@ -261,22 +328,29 @@ async def analyze_repository_basic(
     Orchestrates the BASIC analysis of a GitHub repository (Phase 1).
     """
     repo_path = await clone_repo(request.url, background_tasks)
-    file_paths = walk_directory(repo_path)
+    files = walk_directory(repo_path)
+
+    # Phase 1 only did Python. Parsing goes through the shared process pool
+    # so files are parsed on all cores instead of one at a time.
+    python_files = [
+        (file_path, size) for file_path, size in files
+        if get_language_from_extension(file_path.suffix) == "python"
+    ]
+    results = await parse_files([(file_path, "python") for file_path, _ in python_files])
 
-    # Parse only Python files, and do it simply
     file_nodes: Dict[str, FileNode] = {}
-    for file_path in file_paths:
-        language = get_language_from_extension(file_path.suffix)
-        if language == "python":  # Phase 1 only did Python
-            elements, _ = parse_python_file(file_path)
-            relative_path_str = str(file_path.relative_to(repo_path)).replace("\\", "/")
-
-            file_nodes[relative_path_str] = FileNode(
-                path=relative_path_str,
-                language=language,
-                size=file_path.stat().st_size,
-                elements=elements,
-            )
+    for (file_path, size), result in zip(python_files, results):
+        if result is None:
+            continue
+        elements, _ = result
+        relative_path_str = str(file_path.relative_to(repo_path)).replace("\\", "/")
+
+        file_nodes[relative_path_str] = FileNode(
+            path=relative_path_str,
+            language="python",
+            size=size,
+            elements=elements,
+        )
 
     root_node = build_file_tree(repo_path, file_nodes)
 
@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import List, Set
+from typing import Iterator, List, Set, Tuple
 
 from app.config import settings
 
@@ -17,72 +17,106 @@ DEFAULT_IGNORE_DIRS = {
     "build",
 }
 
-# --- MODIFIED: Added JS/TS extensions ---
-SUPPORTED_EXTENSIONS = {
-    ".py",
-    ".js",
-    ".jsx",
-    ".ts",
-    ".tsx",
+# Maps each supported file extension to its language
+LANG_BY_SUFFIX = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
 }
 
+# Derived from LANG_BY_SUFFIX so the two can't drift apart
+SUPPORTED_EXTENSIONS = frozenset(LANG_BY_SUFFIX)
 
-# --- END MODIFICATION ---
 
 def get_language_from_extension(ext: str) -> str:
     """
     Maps a file extension to its programming language.
     """
-    # --- MODIFIED: Added JS/TS languages ---
-    if ext == ".py":
-        return "python"
-    if ext in {".js", ".jsx"}:
-        return "javascript"
-    if ext in {".ts", ".tsx"}:
-        return "typescript"
-    # --- END MODIFICATION ---
-    return "unknown"
+    return LANG_BY_SUFFIX.get(ext, "unknown")
 
 
-def walk_directory(
-        start_path: Path,
-        ignore_dirs: Set[str] = DEFAULT_IGNORE_DIRS
-) -> List[Path]:
+def _scan_directory(
+        dir_path: str,
+        ignore_dirs: Set[str]
+) -> Iterator[Tuple[str, int]]:
     """
-    Walks a directory and returns a list of paths to supported files.
+    Recursively yields (path, size) for supported files under dir_path.
 
-    Filters out:
-    - Directories in ignore_dirs
-    - Files larger than MAX_FILE_SIZE_BYTES
-    - Files without a supported extension
+    Uses os.scandir so directory checks come from the readdir data, and
+    works on plain strings; Path objects are only built for kept files.
+    Files in a directory are yielded before its subdirectories are
+    visited, matching os.walk's top-down order.
     """
-    supported_files: List[Path] = []
+    try:
+        entries = os.scandir(dir_path)
+    except OSError:
+        # Unreadable directory, os.walk skips these silently too
+        return
+
+    subdirs: List[str] = []
+    with entries:
+        for entry in entries:
+            name = entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if name not in ignore_dirs:
+                        subdirs.append(entry.path)
+                    continue
 
-    for root, dirs, files in os.walk(start_path, topdown=True):
-        # Modify dirs in-place to prune traversal
-        dirs[:] = [d for d in dirs if d not in ignore_dirs]
+                # 1. Check extension (dotfiles like ".py" have no suffix)
+                dot = name.rfind(".")
+                if dot <= 0 or name[dot:] not in SUPPORTED_EXTENSIONS:
+                    continue
 
-        for file_name in files:
-            file_path = Path(root) / file_name
+                if not entry.is_file():
+                    continue
 
-            # 1. Check extension
-            ext = file_path.suffix
-            if ext not in SUPPORTED_EXTENSIONS:
+                # 2. Check file size
+                file_size = entry.stat().st_size
+            except OSError as e:
+                print(f"Error accessing file {entry.path}: {e}")
                 continue
 
-            try:
-                # 2. Check file size
-                file_size = file_path.stat().st_size
-                if file_size > settings.MAX_FILE_SIZE_BYTES:
-                    print(f"Skipping large file: {file_path} ({file_size} bytes)")
-                    continue
-                if file_size == 0:
-                    # Skip empty files
-                    continue
+            if file_size > settings.MAX_FILE_SIZE_BYTES:
+                print(f"Skipping large file: {entry.path} ({file_size} bytes)")
+                continue
+            if file_size == 0:
+                # Skip empty files
+                continue
 
-                supported_files.append(file_path)
+            yield entry.path, file_size
 
-            except (IOError, OSError) as e:
-                print(f"Error accessing file {file_path}: {e}")
+    for subdir in subdirs:
+        yield from _scan_directory(subdir, ignore_dirs)
 
-    return supported_files
\ No newline at end of file
+
+def iter_directory(
+        start_path: Path,
+        ignore_dirs: Set[str] = DEFAULT_IGNORE_DIRS
+) -> Iterator[Tuple[Path, int]]:
+    """
+    Lazily yields (path, size_in_bytes) pairs for supported files, so
+    callers can start on the first files before the walk finishes.
+    Applies the same filters as walk_directory.
+    """
+    for file_path, file_size in _scan_directory(str(start_path), ignore_dirs):
+        yield Path(file_path), file_size
+
+
+def walk_directory(
+        start_path: Path,
+        ignore_dirs: Set[str] = DEFAULT_IGNORE_DIRS
+) -> List[Tuple[Path, int]]:
+    """
+    Walks a directory and returns (path, size_in_bytes) pairs for supported
+    files. The size comes from the stat done here, so callers don't need to
+    stat the file again.
+
+    Filters out:
+    - Directories in ignore_dirs
+    - Files larger than MAX_FILE_SIZE_BYTES
+    - Files without a supported extension
+    """
+    return list(iter_directory(start_path, ignore_dirs))
@@ -1,22 +1,113 @@
 import asyncio
+import contextlib
 import git
+import httpx
+import re
 import shutil
+import stat
 import uuid
+import zipfile
 from pathlib import Path
+from typing import Dict, Tuple
 from fastapi import BackgroundTasks, HTTPException
 from starlette import status
 
 from app.config import settings
 
-# Store paths of active clones to prevent accidental deletion
+# Active clones, each with a lock held while the clone is being written.
+# cleanup_repo takes the same lock, so it can never delete a directory
+# out from under an in-progress clone.
 # In a real production app, this state might be managed in Redis or a DB
-active_clones = set()
+active_clones: Dict[Path, asyncio.Lock] = {}
+
+# Caps simultaneous downloads/clones so a burst of requests doesn't
+# saturate the network and disk
+_clone_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_CLONES)
+
+# Matches https://github.com/<owner>/<repo>[.git][/]
+_GITHUB_URL_RE = re.compile(
+    r"^https?://(?:www\.)?github\.com/([\w.-]+)/([\w.-]+?)(?:\.git)?/?$"
+)
+# Zip of the default branch; redirects to codeload.github.com
+_GITHUB_ARCHIVE_URL = "https://github.com/{owner}/{repo}/archive/HEAD.zip"
+
+
+def _parse_github_url(url: str) -> Tuple[str, str] | None:
+    """
+    Returns (owner, repo) for a github.com repository URL, else None.
+    """
+    match = _GITHUB_URL_RE.match(url)
+    return (match.group(1), match.group(2)) if match else None
+
+
+def _extract_archive(zip_path: Path, repo_path: Path):
+    """
+    Extracts a GitHub archive into repo_path, dropping the single
+    "<repo>-<ref>/" folder GitHub wraps everything in.
+
+    Rejects entries that would land outside repo_path (Zip Slip) and skips
+    symlinks, which the archive stores as files holding the link target.
+    """
+    repo_root = repo_path.resolve()
+    repo_root.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(zip_path) as archive:
+        for member in archive.infolist():
+            _, _, relative_name = member.filename.partition("/")
+            if not relative_name:
+                continue  # The top-level folder itself
+
+            target = (repo_root / relative_name).resolve()
+            if not target.is_relative_to(repo_root):
+                raise ValueError(f"Unsafe path in archive: {member.filename}")
+
+            if member.is_dir():
+                target.mkdir(parents=True, exist_ok=True)
+                continue
+            if stat.S_ISLNK(member.external_attr >> 16):
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with archive.open(member) as src, open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+
+
+async def _download_github_archive(owner: str, repo: str, repo_path: Path) -> bool:
+    """
+    Fetches a GitHub repository as a zip archive and extracts it into
+    repo_path. A single streamed HTTP download is much faster than a git
+    clone for large repos, and nothing here needs the git history.
+
+    Returns False (leaving repo_path absent) if anything goes wrong, so the
+    caller can fall back to git clone.
+    """
+    archive_url = _GITHUB_ARCHIVE_URL.format(owner=owner, repo=repo)
+    zip_path = repo_path.parent / f"{repo_path.name}.zip"
+    try:
+        async with httpx.AsyncClient(
+                follow_redirects=True,
+                timeout=httpx.Timeout(30.0),
+        ) as client:
+            async with client.stream("GET", archive_url) as response:
+                response.raise_for_status()
+                with open(zip_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(1024 * 1024):
+                        f.write(chunk)
+
+        await asyncio.to_thread(_extract_archive, zip_path, repo_path)
+        return True
+    except (httpx.HTTPError, zipfile.BadZipFile, ValueError, OSError) as e:
+        print(f"Archive download failed for {owner}/{repo}, falling back to git clone: {e}")
+        await asyncio.to_thread(shutil.rmtree, repo_path, ignore_errors=True)
+        return False
+    finally:
+        zip_path.unlink(missing_ok=True)
 
 
 async def clone_repo(url: str, background_tasks: BackgroundTasks) -> Path:
     """
     Clones a public GitHub repository into a temporary directory.
 
+    github.com URLs are fetched as a zip archive of the default branch when
+    possible; anything else (or a failed download) uses a shallow git clone.
     Uses asyncio.to_thread to avoid blocking the main event loop.
     Schedules a background task to clean up the repo afterward.
     """
@@ -33,15 +124,18 @@ async def clone_repo(url: str, background_tasks: BackgroundTasks) -> Path:
 
     try:
         print(f"Cloning {url} into {repo_path}...")
-        active_clones.add(str(repo_path))
-
-        # Run the blocking I/O operation in a separate thread
-        await asyncio.to_thread(
-            git.Repo.clone_from,
-            url,
-            repo_path,
-            depth=1  # Only clone the latest commit
-        )
+        repo_lock = active_clones[repo_path] = asyncio.Lock()
+
+        async with _clone_semaphore, repo_lock:
+            github_repo = _parse_github_url(url)
+            if github_repo is None or not await _download_github_archive(*github_repo, repo_path):
+                # Run the blocking I/O operation in a separate thread
+                await asyncio.to_thread(
+                    git.Repo.clone_from,
+                    url,
+                    repo_path,
+                    depth=1  # Only clone the latest commit
+                )
 
         print(f"Successfully cloned {url}.")
 
@@ -72,24 +166,22 @@ async def cleanup_repo(repo_path: Path):
     Removes the cloned repository directory.
     Uses asyncio.to_thread for the blocking rmtree call.
     """
-    repo_path_str = str(repo_path)
-    if not repo_path.exists():
-        print(f"Cleanup not needed (already gone): {repo_path}")
-        if repo_path_str in active_clones:
-            active_clones.remove(repo_path_str)
-        return
-
-    print(f"Cleaning up {repo_path}...")
-    try:
-        # Run the blocking I/O operation in a separate thread
-        await asyncio.to_thread(shutil.rmtree, repo_path)
-        print(f"Successfully cleaned up {repo_path}.")
-    except OSError as e:
-        # This can happen on Windows if files are locked
-        print(f"Warning: Failed to cleanup {repo_path}. Error: {e}")
-    finally:
-        if repo_path_str in active_clones:
-            active_clones.remove(repo_path_str)
+    # Wait for a clone still writing into this directory to finish
+    async with active_clones.get(repo_path) or contextlib.nullcontext():
+        try:
+            if not repo_path.exists():
+                print(f"Cleanup not needed (already gone): {repo_path}")
+                return
+
+            print(f"Cleaning up {repo_path}...")
+            # Run the blocking I/O operation in a separate thread
+            await asyncio.to_thread(shutil.rmtree, repo_path)
+            print(f"Successfully cleaned up {repo_path}.")
+        except OSError as e:
+            # This can happen on Windows if files are locked
+            print(f"Warning: Failed to cleanup {repo_path}. Error: {e}")
+        finally:
+            active_clones.pop(repo_path, None)
 
 
 def get_active_clones_count() -> int:
@@ -0,0 +1,96 @@
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+# Node size and spacing carried over from the backend's previous dagre
+# layout. Unlike dagre, which placed node centres, layered_layout returns
+# top-left corners, which is what React Flow's node.position means.
+NODE_WIDTH = 250
+NODE_HEIGHT = 50
+NODE_SEP = 50  # Horizontal gap between nodes in a rank
+RANK_SEP = 100  # Vertical gap between ranks
+
+
+def longest_path_ranks(adjacency: List[List[int]]) -> List[int]:
+    """
+    Assigns each node a rank (layer) so that every edge points to a lower
+    layer: rank[v] is the length of the longest path reaching v.
+
+    Uses Kahn's topological sort. Import graphs can contain cycles, so when
+    no node is left without unprocessed predecessors, the lowest-id
+    remaining node is taken anyway and its edges back into already ranked
+    nodes are ignored.
+    """
+    node_count = len(adjacency)
+    indegree = [0] * node_count
+    for neighbors in adjacency:
+        for neighbor in neighbors:
+            indegree[neighbor] += 1
+
+    rank = [0] * node_count
+    placed = bytearray(node_count)
+    queue = deque(node for node in range(node_count) if indegree[node] == 0)
+    placed_count = 0
+    next_unplaced = 0
+
+    while placed_count < node_count:
+        if not queue:
+            # Only cycles remain: break one at the first unplaced node
+            while placed[next_unplaced]:
+                next_unplaced += 1
+            queue.append(next_unplaced)
+
+        node = queue.popleft()
+        if placed[node]:
+            continue
+        placed[node] = 1
+        placed_count += 1
+
+        next_rank = rank[node] + 1
+        for neighbor in adjacency[node]:
+            if placed[neighbor]:
+                continue  # Edge closing a broken cycle
+            if next_rank > rank[neighbor]:
+                rank[neighbor] = next_rank
+            indegree[neighbor] -= 1
+            if indegree[neighbor] == 0:
+                queue.append(neighbor)
+
+    return rank
+
+
+def layered_layout(
+        node_ids: List[str],
+        edges: Iterable[Tuple[str, str]]
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Computes a top-to-bottom layered layout for a directed graph.
+
+    Returns the top-left (x, y) position of every node. Ranks come from
+    longest_path_ranks; nodes within a rank keep their input order and
+    each rank is centered on x = 0.
+    """
+    id_of = {node_id: i for i, node_id in enumerate(node_ids)}
+    adjacency: List[List[int]] = [[] for _ in node_ids]
+    for source, target in edges:
+        source_id = id_of.get(source)
+        target_id = id_of.get(target)
+        if source_id is not None and target_id is not None:
+            adjacency[source_id].append(target_id)
+
+    ranks = longest_path_ranks(adjacency)
+
+    layers: Dict[int, List[int]] = {}
+    for node, rank in enumerate(ranks):
+        layers.setdefault(rank, []).append(node)
+
+    positions: Dict[str, Tuple[float, float]] = {}
+    x_step = NODE_WIDTH + NODE_SEP
+    y_step = NODE_HEIGHT + RANK_SEP
+    for rank, layer in layers.items():
+        # Shift so the layer's centre sits at x = 0
+        x_offset = (len(layer) - 1) * x_step / 2 + NODE_WIDTH / 2
+        y = rank * y_step
+        for index, node in enumerate(layer):
+            positions[node_ids[node]] = (index * x_step - x_offset, y)
+
+    return positions
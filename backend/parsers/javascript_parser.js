@@ -1,6 +1,14 @@
 const fs = require('fs');
 const parser = require('@babel/parser');
 
+// Parser options are built once and shared by every parse, so the long-lived
+// worker always calls parser.parse() with the same (monomorphic) object.
+const PARSE_OPTS = Object.freeze({
+  sourceType: 'module',
+  plugins: Object.freeze(['typescript', 'jsx']),
+  errorRecovery: true, // Try to parse even with errors
+});
+
 // Helper function to get docstrings
 function getDocstring(node) {
   const comments = node.leadingComments;
@@ -53,118 +61,160 @@ function getFunctionDetails(node) {
   return { params, returnType };
 }
 
+// Helper to name a class's superclass: `Base` or dotted `React.Component`.
+// Any other expression (e.g. `mixin(Base)`) is returned as its source text,
+// like the Python parser does for base classes.
+function getExpressionName(node, content) {
+  if (node.type === 'Identifier') {
+    return node.name;
+  }
+  if (node.type === 'MemberExpression' && !node.computed && node.property.type === 'Identifier') {
+    return `${getExpressionName(node.object, content)}.${node.property.name}`;
+  }
+  return content.slice(node.start, node.end);
+}
+
 // Main parsing function
+// Returns { elements, imports } and throws if the file cannot be read/parsed
 function parseFile(filePath) {
   const elements = [];
   const imports = [];
 
-  try {
-    const content = fs.readFileSync(filePath, 'utf-8');
-    const ast = parser.parse(content, {
-      sourceType: 'module',
-      plugins: ['typescript', 'jsx'],
-      errorRecovery: true, // Try to parse even with errors
-    });
-
-    for (const node of ast.program.body) {
-      // 1. Find Imports
-      if (node.type === 'ImportDeclaration' || node.type === 'ExportAllDeclaration' || node.type === 'ExportNamedDeclaration') {
-        if (node.source) {
-          imports.push(node.source.value);
-        }
-      }
+  const content = fs.readFileSync(filePath, 'utf-8');
+  const ast = parser.parse(content, PARSE_OPTS);
 
-      // 2. Find Functions (FunctionDeclaration)
-      if (node.type === 'FunctionDeclaration' || (node.type === 'ExportNamedDeclaration' && node.declaration?.type === 'FunctionDeclaration') || (node.type === 'ExportDefaultDeclaration' && node.declaration?.type === 'FunctionDeclaration')) {
-        const funcNode = node.declaration || node;
-        const { params, returnType } = getFunctionDetails(funcNode);
-        elements.push({
-          type: 'function',
-          name: funcNode.id ? funcNode.id.name : 'defaultExport',
-          start_line: funcNode.loc.start.line,
-          end_line: funcNode.loc.end.line,
-          docstring: getDocstring(node),
-          parameters: params,
-          return_type: returnType,
-        });
+  for (const node of ast.program.body) {
+    // 1. Find Imports
+    if (node.type === 'ImportDeclaration' || node.type === 'ExportAllDeclaration' || node.type === 'ExportNamedDeclaration') {
+      if (node.source) {
+        imports.push(node.source.value);
       }
+    }
 
-      // --- NEW: Find exported arrow functions (e.g., export const MyComponent = () => ...) ---
-      if (node.type === 'ExportNamedDeclaration' && node.declaration?.type === 'VariableDeclaration') {
-        for (const declarator of node.declaration.declarations) {
-          if (declarator.id.type === 'Identifier' && declarator.init?.type === 'ArrowFunctionExpression') {
-            const funcNode = declarator.init;
-            const { params, returnType } = getFunctionDetails(funcNode);
-
-            elements.push({
-              type: 'function',
-              name: declarator.id.name,
-              start_line: funcNode.loc.start.line,
-              end_line: funcNode.loc.end.line,
-              docstring: getDocstring(node), // Docstring is on the export
-              parameters: params,
-              return_type: returnType,
-            });
-          }
+    // 2. Find Functions (FunctionDeclaration)
+    if (node.type === 'FunctionDeclaration' || (node.type === 'ExportNamedDeclaration' && node.declaration?.type === 'FunctionDeclaration') || (node.type === 'ExportDefaultDeclaration' && node.declaration?.type === 'FunctionDeclaration')) {
+      const funcNode = node.declaration || node;
+      const { params, returnType } = getFunctionDetails(funcNode);
+      elements.push({
+        type: 'function',
+        name: funcNode.id ? funcNode.id.name : 'defaultExport',
+        start_line: funcNode.loc.start.line,
+        end_line: funcNode.loc.end.line,
+        docstring: getDocstring(node),
+        parameters: params,
+        return_type: returnType,
+      });
+    }
+
+    // --- NEW: Find exported arrow functions (e.g., export const MyComponent = () => ...) ---
+    if (node.type === 'ExportNamedDeclaration' && node.declaration?.type === 'VariableDeclaration') {
+      for (const declarator of node.declaration.declarations) {
+        if (declarator.id.type === 'Identifier' && declarator.init?.type === 'ArrowFunctionExpression') {
+          const funcNode = declarator.init;
+          const { params, returnType } = getFunctionDetails(funcNode);
+
+          elements.push({
+            type: 'function',
+            name: declarator.id.name,
+            start_line: funcNode.loc.start.line,
+            end_line: funcNode.loc.end.line,
+            docstring: getDocstring(node), // Docstring is on the export
+            parameters: params,
+            return_type: returnType,
+          });
         }
       }
-      // --- END NEW ---
-
-      // 3. Find Classes
-      if (node.type === 'ClassDeclaration' || (node.type === 'ExportNamedDeclaration' && node.declaration?.type === 'ClassDeclaration') || (node.type === 'ExportDefaultDeclaration' && node.declaration?.type === 'ClassDeclaration')) {
-        const classNode = node.declaration || node;
-        const baseClasses = classNode.superClass ? [classNode.superClass.name] : [];
-
-        elements.push({
-          type: 'class',
-          name: classNode.id ? classNode.id.name : 'defaultExport',
-          start_line: classNode.loc.start.line,
-          end_line: classNode.loc.end.line,
-          docstring: getDocstring(node),
-          base_classes: baseClasses,
-        });
-
-        // 4. Find Methods within Classes
-        for (const bodyNode of classNode.body.body) {
-          if (bodyNode.type === 'ClassMethod' || bodyNode.type === 'ClassPrivateMethod') {
-            const { params, returnType } = getFunctionDetails(bodyNode);
-
-            let name = 'computed'; // Default for computed properties
-            if (bodyNode.key.type === 'Identifier') {
-              name = bodyNode.key.name; // For constructor, public/private methods
-            } else if (bodyNode.key.type === 'PrivateName') {
-              name = bodyNode.key.id.name; // For private fields #myMethod
-            }
-
-            elements.push({
-              type: 'method',
-              name: name,
-              start_line: bodyNode.loc.start.line,
-              end_line: bodyNode.loc.end.line,
-              docstring: getDocstring(bodyNode),
-              parameters: params,
-              return_type: returnType,
-            });
+    }
+    // --- END NEW ---
+
+    // 3. Find Classes
+    if (node.type === 'ClassDeclaration' || (node.type === 'ExportNamedDeclaration' && node.declaration?.type === 'ClassDeclaration') || (node.type === 'ExportDefaultDeclaration' && node.declaration?.type === 'ClassDeclaration')) {
+      const classNode = node.declaration || node;
+      const baseClasses = classNode.superClass ? [getExpressionName(classNode.superClass, content)] : [];
+
+      elements.push({
+        type: 'class',
+        name: classNode.id ? classNode.id.name : 'defaultExport',
+        start_line: classNode.loc.start.line,
+        end_line: classNode.loc.end.line,
+        docstring: getDocstring(node),
+        base_classes: baseClasses,
+      });
+
+      // 4. Find Methods within Classes
+      for (const bodyNode of classNode.body.body) {
+        if (bodyNode.type === 'ClassMethod' || bodyNode.type === 'ClassPrivateMethod') {
+          const { params, returnType } = getFunctionDetails(bodyNode);
+
+          let name = 'computed'; // Default for computed properties
+          if (bodyNode.key.type === 'Identifier') {
+            name = bodyNode.key.name; // For constructor, public/private methods
+          } else if (bodyNode.key.type === 'PrivateName') {
+            name = bodyNode.key.id.name; // For private fields #myMethod
           }
+
+          elements.push({
+            type: 'method',
+            name: name,
+            start_line: bodyNode.loc.start.line,
+            end_line: bodyNode.loc.end.line,
+            docstring: getDocstring(bodyNode),
+            parameters: params,
+            return_type: returnType,
+          });
         }
       }
     }
+  }
 
-    // Output JSON to stdout
-    console.log(JSON.stringify({ elements, imports }));
+  return { elements, imports };
+}
 
-  } catch (error) {
-    // Output error to stderr and exit
-    console.error(`Error parsing ${filePath}: ${error.message}`);
-    process.exit(1);
-  }
+// Long-lived worker mode: reads newline-delimited JSON requests ({ id, path })
+// from stdin and writes one JSON response per line to stdout.
+function runServer() {
+  const readline = require('readline');
+  const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+
+  rl.on('line', (line) => {
+    if (!line.trim()) {
+      return;
+    }
+
+    let request;
+    try {
+      request = JSON.parse(line);
+    } catch (error) {
+      console.error(`Error decoding request: ${error.message}`);
+      return;
+    }
+
+    let response;
+    try {
+      response = { id: request.id, ...parseFile(request.path) };
+    } catch (error) {
+      response = { id: request.id, error: `Error parsing ${request.path}: ${error.message}` };
+    }
+    process.stdout.write(JSON.stringify(response) + '\n');
+  });
 }
 
-// Get file path from command line argument
-const filePath = process.argv[2];
-if (!filePath) {
+// Get file path (or --server) from command line argument
+const arg = process.argv[2];
+if (!arg) {
   console.error('Error: No file path provided.');
   process.exit(1);
 }
 
-parseFile(filePath);
\ No newline at end of file
+if (arg === '--server') {
+  runServer();
+} else {
+  try {
+    // Output JSON to stdout
+    console.log(JSON.stringify(parseFile(arg)));
+  } catch (error) {
+    // Output error to stderr and exit
+    console.error(`Error parsing ${arg}: ${error.message}`);
+    process.exit(1);
+  }
+}
@@ -0,0 +1,66 @@
+import hashlib
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from app.config import BASE_DIR, settings
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_parse_cache(tmp_path_factory: pytest.TempPathFactory):
+    # Keep the suite off the developer's real parse cache: it is disabled,
+    # and tests that turn it on write under the session temp directory
+    with pytest.MonkeyPatch.context() as patcher:
+        patcher.setattr(settings, "PARSE_CACHE_ENABLED", False)
+        patcher.setattr(settings, "PARSE_CACHE_DIR", tmp_path_factory.mktemp("parse-cache"))
+        yield
+
+
+def _node_deps_hash(backend_dir: Path) -> str | None:
+    """
+    Hashes the lockfile (or package.json if there is none), so a stale
+    node_modules is detected without listing its contents.
+    """
+    deps_file = backend_dir / "package-lock.json"
+    if not deps_file.exists():
+        deps_file = backend_dir / "package.json"
+    try:
+        return hashlib.sha256(deps_file.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+@pytest.fixture(scope="session")
+def install_node_deps():
+    backend_dir = BASE_DIR
+    node_modules = backend_dir / "node_modules"
+    stamp_file = node_modules / ".install-stamp"
+    deps_hash = _node_deps_hash(backend_dir)
+
+    if deps_hash is None:
+        # No dependency manifest to compare: only install if missing
+        if node_modules.exists():
+            return
+    elif node_modules.is_dir() and stamp_file.exists() and stamp_file.read_text() == deps_hash:
+        return
+
+    # npm is a .cmd shim on Windows, which only resolves without a shell
+    # when named explicitly
+    npm_exe = "npm.cmd" if os.name == "nt" else "npm"
+    if not shutil.which(npm_exe):
+        pytest.skip("npm not available")
+
+    print("\nInstalling Node.js dependencies for tests...")
+    subprocess.run(
+        [npm_exe, "install"],
+        cwd=backend_dir,
+        check=True,
+        # Progress output is discarded; stderr is kept for the failure report
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    if deps_hash is not None:
+        stamp_file.write_text(deps_hash)
@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+from pathlib import Path
+
+from app.models import FileNode, FolderNode, CircularDependency
+from app.services import analysis_service
+from app.services.analysis_service import (
+    _build_react_flow_graph,
+    _walk_and_parse,
+    build_file_tree,
+)
+
+
+def _tree_shape(node):
+    # (path, [children]) for folders, the bare path for files
+    if isinstance(node, FolderNode):
+        return node.path, [_tree_shape(child) for child in node.children]
+    return node.path
+
+
+def test_build_file_tree():
+    paths = [
+        "setup.py",
+        "pkg/sub/deep.py",
+        "pkg/main.py",
+        "pkg-extra/util.py",
+        "README.md",
+        "pkg/sub/inner/leaf.py",
+        "pkg/a.py",
+        "docs/index.md",
+    ]
+    file_nodes = {
+        path: FileNode(path=path, language="python", size=1) for path in paths
+    }
+
+    tree = build_file_tree(Path("."), file_nodes)
+
+    # Children follow sorted path order, folders created on first use
+    assert _tree_shape(tree) == (".", [
+        "README.md",
+        ("docs", ["docs/index.md"]),
+        ("pkg-extra", ["pkg-extra/util.py"]),
+        ("pkg", [
+            "pkg/a.py",
+            "pkg/main.py",
+            ("pkg/sub", [
+                "pkg/sub/deep.py",
+                ("pkg/sub/inner", ["pkg/sub/inner/leaf.py"]),
+            ]),
+        ]),
+        "setup.py",
+    ])
+    assert tree.children[0] is file_nodes["README.md"]
+
+
+def test_build_react_flow_graph_marks_only_cycle_edges():
+    paths = ["a.py", "b.py", "c.py", "d.py"]
+    all_files = {
+        path: FileNode(path=path, language="python", size=1) for path in paths
+    }
+    # Two separate cycles (a <-> b, c <-> d) plus a one-way edge b -> c
+    graph = {"a.py": ["b.py"], "b.py": ["a.py", "c.py"], "c.py": ["d.py"], "d.py": ["c.py"]}
+    circular_deps = [
+        CircularDependency(nodes=["b.py", "a.py"]),
+        CircularDependency(nodes=["d.py", "c.py"]),
+    ]
+
+    nodes, edges = _build_react_flow_graph(all_files, graph, circular_deps)
+
+    red_edges = {(edge.source, edge.target) for edge in edges if edge.style}
+    assert red_edges == {
+        ("a.py", "b.py"), ("b.py", "a.py"), ("c.py", "d.py"), ("d.py", "c.py")
+    }
+    assert all(node.type == "customError" for node in nodes)
+
+
+@pytest.mark.asyncio
+async def test_walk_and_parse_overlaps_batches(tmp_path: Path, monkeypatch):
+    for name in ("a.py", "b.js", "c.py", "d.ts"):
+        (tmp_path / name).write_text("x = 1\n", encoding="utf-8")
+    monkeypatch.setattr(analysis_service, "WALK_BATCH_SIZE", 1)
+
+    active = 0
+    overlapped = asyncio.Event()
+
+    async def fake_parse_files(items, **kwargs):
+        nonlocal active
+        active += 1
+        if active > 1:
+            overlapped.set()
+        # A batch only finishes once another one is in flight, so parsing
+        # the batches one after another times out here
+        await asyncio.wait_for(overlapped.wait(), timeout=5)
+        active -= 1
+        return [([], []) for _ in items]
+
+    monkeypatch.setattr(analysis_service, "parse_files", fake_parse_files)
+
+    file_nodes = await _walk_and_parse(tmp_path)
+
+    assert sorted(file_nodes) == ["a.py", "b.js", "c.py", "d.ts"]
+    assert file_nodes["b.js"].language == "javascript"
@@ -3,6 +3,7 @@ from app.models import FileNode
 from app.parsers.dependency_analyzer import (
     _resolve_relative_import,
     build_dependency_graph,
+    analyze_dependencies,
     find_circular_dependencies
 )
 
@@ -61,6 +62,29 @@ def test_resolve_relative_import(mock_file_nodes):
     assert resolved is None
 
 
+def test_resolve_relative_import_from_top_level():
+    files = {
+        "index.js": FileNode(path="index.js", language="javascript", size=10),
+        "lib/index.js": FileNode(path="lib/index.js", language="javascript", size=10),
+    }
+
+    resolved = _resolve_relative_import("./lib", files["index.js"], files)
+    assert resolved == "lib/index.js"
+
+
+def test_resolve_relative_import_uses_file_language():
+    files = {
+        "src/app.js": FileNode(path="src/app.js", language="javascript", size=10),
+        "src/app.ts": FileNode(path="src/app.ts", language="typescript", size=10),
+        "src/util.js": FileNode(path="src/util.js", language="javascript", size=10),
+        "src/util.ts": FileNode(path="src/util.ts", language="typescript", size=10),
+        "src/util.py": FileNode(path="src/util.py", language="python", size=10),
+    }
+
+    assert _resolve_relative_import("./util", files["src/app.js"], files) == "src/util.js"
+    assert _resolve_relative_import("./util", files["src/app.ts"], files) == "src/util.ts"
+
+
 def test_build_dependency_graph(mock_file_nodes):
     graph = build_dependency_graph(mock_file_nodes)
 
@@ -78,6 +102,21 @@ def test_build_dependency_graph(mock_file_nodes):
     assert "app/services/user_service.py" in graph["app/services/auth_service.py"]
 
 
+def test_analyze_dependencies(mock_file_nodes):
+    graph = build_dependency_graph(mock_file_nodes)
+    analysis = analyze_dependencies(mock_file_nodes, graph)
+
+    info_map = {info.path: info for info in analysis.most_imported}
+    assert info_map["app/services/auth_service.py"].imported_by_count == 2
+    assert info_map["app/services/user_service.py"].imported_by_count == 2
+    assert info_map["app/utils/helpers.py"].imported_by_count == 1
+    assert info_map["app/main.py"].imported_by_count == 0
+
+    assert analysis.most_imported[0].imported_by_count == 2
+    assert analysis.most_importing[0].imports_count == 2
+    assert analysis.isolated_files == []
+
+
 def test_find_circular_dependencies(mock_file_nodes):
     graph = build_dependency_graph(mock_file_nodes)
     cycles = find_circular_dependencies(graph)
@@ -90,4 +129,30 @@ def test_find_circular_dependencies(mock_file_nodes):
     assert cycle_nodes == [
         "app/services/auth_service.py",
         "app/services/user_service.py"
-    ]
\ No newline at end of file
+    ]
+
+def test_find_circular_dependencies_overlapping_cycles():
+    # a -> b -> a and b -> c -> a share nodes, so they form a single SCC
+    graph = {
+        "a.py": ["b.py"],
+        "b.py": ["a.py", "c.py"],
+        "c.py": ["a.py", "d.py"],
+        "d.py": [],
+        "self.py": ["self.py"],
+    }
+    cycles = find_circular_dependencies(graph)
+
+    cycle_sets = sorted(sorted(cycle.nodes) for cycle in cycles)
+    assert cycle_sets == [["a.py", "b.py", "c.py"], ["self.py"]]
+
+
+def test_find_circular_dependencies_deep_chain():
+    # A long import chain must not hit the recursion limit
+    depth = 5000
+    graph = {f"f{i}.py": [f"f{i + 1}.py"] for i in range(depth)}
+    graph[f"f{depth}.py"] = ["f0.py"]
+
+    cycles = find_circular_dependencies(graph)
+
+    assert len(cycles) == 1
+    assert len(cycles[0].nodes) == depth + 1
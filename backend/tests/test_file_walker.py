@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from app.config import settings
+from app.utils.file_walker import walk_directory, iter_directory
+
+
+def _write(path: Path, content: str = "x = 1\n"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def test_walk_directory_filters(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE_BYTES", 100)
+
+    _write(tmp_path / "main.py")
+    _write(tmp_path / "src" / "app.tsx")
+    _write(tmp_path / "src" / "lib" / "util.js")
+    _write(tmp_path / "README.md")  # Unsupported extension
+    _write(tmp_path / "empty.py", "")  # Empty
+    _write(tmp_path / "big.py", "#" * 101)  # Over MAX_FILE_SIZE_BYTES
+    _write(tmp_path / "node_modules" / "dep" / "index.js")  # Ignored dir
+    _write(tmp_path / "pkg" / "__pycache__" / "mod.py")  # Ignored, nested
+    # Hidden files need a real suffix ("name.ext"); ".py" alone has none
+    _write(tmp_path / ".py")
+    _write(tmp_path / ".eslintrc.js")
+    # Hidden directories are walked unless listed in the ignore set
+    _write(tmp_path / ".github" / "scripts" / "check.py")
+
+    files = walk_directory(tmp_path)
+
+    relative = sorted(path.relative_to(tmp_path).as_posix() for path, _ in files)
+    assert relative == [
+        ".eslintrc.js",
+        ".github/scripts/check.py",
+        "main.py",
+        "src/app.tsx",
+        "src/lib/util.js",
+    ]
+
+    # Like os.walk top-down: a directory's files come before its subfolders'
+    walk_order = [path.relative_to(tmp_path).as_posix() for path, _ in files]
+    assert walk_order.index("main.py") < walk_order.index("src/app.tsx")
+    assert walk_order.index("src/app.tsx") < walk_order.index("src/lib/util.js")
+
+
+def test_walk_directory_returns_paths_and_sizes(tmp_path: Path):
+    _write(tmp_path / "a.py", "print('hi')\n")
+    _write(tmp_path / "sub" / "b.ts", "export {};\n")
+
+    files = walk_directory(tmp_path, ignore_dirs={"sub"})
+
+    assert files == [(tmp_path / "a.py", len("print('hi')\n"))]
+    assert isinstance(files[0][0], Path)
+    # The lazy variant yields the same pairs
+    assert list(iter_directory(tmp_path, ignore_dirs={"sub"})) == files
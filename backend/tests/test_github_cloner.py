@@ -0,0 +1,51 @@
+import stat
+import zipfile
+import pytest
+from pathlib import Path
+
+from app.utils.github_cloner import _extract_archive, _parse_github_url
+
+
+def test_parse_github_url():
+    assert _parse_github_url("https://github.com/owner/repo") == ("owner", "repo")
+    assert _parse_github_url("https://github.com/owner/repo.git") == ("owner", "repo")
+    assert _parse_github_url("https://github.com/owner/repo/tree/main") is None
+    assert _parse_github_url("https://gitlab.com/owner/repo") is None
+
+
+def test_extract_archive_strips_top_folder(tmp_path: Path):
+    zip_path = tmp_path / "repo.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("repo-main/", "")
+        archive.writestr("repo-main/app/main.py", "print('hi')\n")
+        archive.writestr("repo-main/README.md", "# repo\n")
+
+    _extract_archive(zip_path, tmp_path / "out")
+
+    assert (tmp_path / "out" / "app" / "main.py").read_text() == "print('hi')\n"
+    assert (tmp_path / "out" / "README.md").exists()
+
+
+def test_extract_archive_rejects_zip_slip(tmp_path: Path):
+    zip_path = tmp_path / "evil.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("repo-main/../../escaped.py", "x = 1\n")
+
+    with pytest.raises(ValueError):
+        _extract_archive(zip_path, tmp_path / "out")
+
+    assert not (tmp_path / "escaped.py").exists()
+
+
+def test_extract_archive_skips_symlinks(tmp_path: Path):
+    zip_path = tmp_path / "repo.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("repo-main/app/main.py", "print('hi')\n")
+        link = zipfile.ZipInfo("repo-main/app/alias.py")
+        link.external_attr = (stat.S_IFLNK | 0o777) << 16
+        archive.writestr(link, "main.py")
+
+    _extract_archive(zip_path, tmp_path / "out")
+
+    assert (tmp_path / "out" / "app" / "main.py").exists()
+    assert not (tmp_path / "out" / "app" / "alias.py").exists()
@@ -0,0 +1,33 @@
+from app.utils.graph_layout import (
+    longest_path_ranks,
+    layered_layout,
+    NODE_HEIGHT,
+    RANK_SEP,
+)
+
+
+def test_longest_path_ranks():
+    # 0 -> 1 -> 2 and a shortcut 0 -> 2: 2 must sit below 1
+    assert longest_path_ranks([[1, 2], [2], []]) == [0, 1, 2]
+
+
+def test_longest_path_ranks_with_cycle():
+    # 0 -> 1 -> 2 -> 1, plus an isolated node and a self-loop
+    ranks = longest_path_ranks([[1], [2], [1], [3]])
+
+    assert ranks[0] == 0
+    assert ranks[1] == 1
+    assert ranks[2] == 2
+    assert ranks[3] == 0
+
+
+def test_layered_layout():
+    positions = layered_layout(
+        ["main.py", "a.py", "b.py"],
+        [("main.py", "a.py"), ("main.py", "b.py"), ("main.py", "unknown.py")],
+    )
+
+    assert positions["main.py"][1] == 0
+    assert positions["a.py"][1] == positions["b.py"][1] == NODE_HEIGHT + RANK_SEP
+    # Siblings are spread around the parent's centre line
+    assert positions["a.py"][0] < positions["main.py"][0] < positions["b.py"][0]
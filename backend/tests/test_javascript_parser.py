@@ -1,16 +1,20 @@
+import asyncio
+import sys
 import pytest
+import pytest_asyncio
 import textwrap
+from collections import namedtuple
 from pathlib import Path
-import subprocess
-import os
 
-from app.parsers.javascript_parser import parse_javascript_file
-from app.config import BASE_DIR
+from app.parsers import javascript_parser
+from app.parsers.javascript_parser import JSParserPool, parse_javascript_file
 
 
-@pytest.fixture
-def sample_tsx_file(tmp_path: Path) -> Path:
-    content = textwrap.dedent("""
+# The element fields compared in one assertion
+Expected = namedtuple("Expected", "name type parameters return_type")
+
+
+_TSX_BYTES = textwrap.dedent("""
     import React from 'react';
     import { Button } from './components/Button';
     import * as api from '../api/client';
@@ -29,50 +33,104 @@ def sample_tsx_file(tmp_path: Path) -> Path:
         // A private method
       }
     }
-    """)
-    file_path = tmp_path / "MyComponent.tsx"
-    file_path.write_text(content, encoding="utf-8")
+    """).encode("utf-8")
+
+
+@pytest.fixture(scope="session")
+def sample_tsx_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # The parsers only read this file, so one copy serves every test
+    file_path = tmp_path_factory.mktemp("tsx") / "MyComponent.tsx"
+    file_path.write_bytes(_TSX_BYTES)
     return file_path
 
 
-@pytest.fixture(scope="session", autouse=True)
-def install_node_deps():
-    backend_dir = BASE_DIR
-    if not (backend_dir / "node_modules").exists():
-        print("\nInstalling Node.js dependencies for tests...")
-        subprocess.run(
-            ["npm", "install"],
-            cwd=backend_dir,
-            check=True,
-            capture_output=True,
-            shell=True  # Added for Windows compatibility
-        )
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def parsed_tsx(install_node_deps, sample_tsx_file: Path):
+    # Parsed once and shared; tests only assert on the result. Needs the
+    # Node dependencies, so it requests them itself
+    return await parse_javascript_file(sample_tsx_file)
 
 
-@pytest.mark.asyncio
-async def test_parse_javascript_file(sample_tsx_file: Path):
-    elements, imports = await parse_javascript_file(sample_tsx_file)
+@pytest.fixture(scope="session")
+def tsx_element_map(parsed_tsx):
+    elements, _ = parsed_tsx
+    return {el.name: el for el in elements}
+
+
+@pytest.mark.slow
+def test_parse_javascript_file(parsed_tsx, tsx_element_map):
+    elements, imports = parsed_tsx
 
     assert len(imports) == 3
-    assert "react" in imports
-    assert "./components/Button" in imports
-    assert "../api/client" in imports
+    assert {"react", "./components/Button", "../api/client"} <= frozenset(imports)
 
     assert len(elements) >= 3
 
-    element_map = {el.name: el for el in elements}
-
-    assert "MyComponent" in element_map
-    comp = element_map["MyComponent"]
-    assert comp.type == "function"
+    assert "MyComponent" in tsx_element_map
+    comp = tsx_element_map["MyComponent"]
+    assert (comp.name, comp.type, comp.parameters, comp.return_type) == Expected(
+        "MyComponent", "function", ["name"], "string"
+    )
     assert "This is a sample component." in comp.docstring
-    assert comp.parameters == ["name"]
-    assert comp.return_type == "string"
 
-    assert "MyClass" in element_map
-    cls = element_map["MyClass"]
+    assert "MyClass" in tsx_element_map
+    cls = tsx_element_map["MyClass"]
     assert cls.type == "class"
 
-    assert "myMethod" in element_map
-    method = element_map["myMethod"]
-    assert method.type == "method"
\ No newline at end of file
+    assert "myMethod" in tsx_element_map
+    method = tsx_element_map["myMethod"]
+    assert method.type == "method"
+
+
+@pytest.mark.asyncio
+async def test_parser_pool_recovers_after_worker_exits(monkeypatch):
+    create_subprocess_exec = asyncio.create_subprocess_exec
+
+    async def spawn_exiting_worker(*args, **kwargs):
+        # Stands in for a Node worker that crashes on startup
+        return await create_subprocess_exec(sys.executable, "-c", "pass", **kwargs)
+
+    monkeypatch.setattr(javascript_parser.asyncio, "create_subprocess_exec", spawn_exiting_worker)
+    pool = JSParserPool()
+
+    # Every round must fail fast instead of waiting on a dead worker
+    for _ in range(5):
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                *(pool.parse(Path("a.js")) for _ in range(20)),
+                return_exceptions=True
+            ),
+            timeout=10
+        )
+        assert all(isinstance(result, Exception) for result in results)
+
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_parser_pool_replaces_worker_after_timeout(monkeypatch):
+    create_subprocess_exec = asyncio.create_subprocess_exec
+    workers = []
+
+    async def spawn_silent_worker(*args, **kwargs):
+        # Stands in for a Node worker stuck on a file: it never answers
+        worker = await create_subprocess_exec(
+            sys.executable, "-c", "import time; time.sleep(60)", **kwargs
+        )
+        workers.append(worker)
+        return worker
+
+    monkeypatch.setattr(javascript_parser.asyncio, "create_subprocess_exec", spawn_silent_worker)
+    monkeypatch.setattr(javascript_parser, "NODE_RESPONSE_TIMEOUT_SECONDS", 0.2)
+    pool = JSParserPool()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await pool.parse(Path("hung.js"))
+    # The stuck worker is killed and the next request gets a fresh one
+    assert await asyncio.wait_for(workers[0].wait(), timeout=5) is not None
+
+    with pytest.raises(asyncio.TimeoutError):
+        await pool.parse(Path("next.js"))
+    assert len(workers) == 2
+
+    await pool.close()
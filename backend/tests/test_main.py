@@ -1,12 +1,21 @@
 import pytest
+from typing import Iterator
+from unittest.mock import patch
 from fastapi.testclient import TestClient
 from fastapi import HTTPException
 from app.main import app
+from app.models import DependencyAnalysis, DependencyInfo
 
-client = TestClient(app)
 
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    # Built on first use and shared; entering the client runs the app's
+    # lifespan once, so every test hits the started-up app
+    with TestClient(app) as test_client:
+        yield test_client
 
-def test_get_health():
+
+def test_get_health(client):
     """
     Tests the /health endpoint.
     """
@@ -15,7 +24,7 @@ def test_get_health():
     assert response.json() == {"status": "ok"}
 
 
-def test_get_stats():
+def test_get_stats(client):
     """
     Tests the /stats endpoint.
     """
@@ -24,19 +33,69 @@ def test_get_stats():
     assert response.json() == {"cloned_repos_count": 0}
 
 
-@pytest.mark.asyncio
-async def test_post_analyze_invalid_url(mocker):
+def test_cors_preflight(client):
+    """
+    Tests that CORS preflight requests are answered for any origin.
+    """
+    response = client.options(
+        "/analyze",
+        headers={
+            "Origin": "http://localhost:3000",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "content-type",
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["access-control-allow-headers"] == "content-type"
+    assert "POST" in response.headers["access-control-allow-methods"]
+
+
+def test_cors_simple_request(client):
+    """
+    Tests that CORS headers are added to regular cross-origin responses.
+    """
+    response = client.get("/health", headers={"Origin": "http://localhost:3000"})
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+    assert response.headers["access-control-allow-credentials"] == "true"
+
+    response = client.get("/health")
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_post_analyze_invalid_url(client):
     """
     Tests the /analyze endpoint with a URL that will fail to clone.
     We mock the cloner to raise an exception.
     """
     # Mock the clone_repo function to simulate a GitCommandError
-    mocker.patch(
+    with patch(
         "app.services.analysis_service.clone_repo",
         side_effect=HTTPException(status_code=400, detail="Failed to clone")
-    )
-
-    response = client.post("/analyze", json={"url": "invalid-url"})
+    ):
+        response = client.post("/analyze", json={"url": "invalid-url"})
 
     assert response.status_code == 400
-    assert response.json() == {"detail": "Failed to clone"}
\ No newline at end of file
+    assert response.json() == {"detail": "Failed to clone"}
+
+def test_post_analyze_dependencies(client):
+    """
+    Tests that /analyze/dependencies returns the serialized dependency stats.
+    """
+    dependencies = DependencyAnalysis(
+        most_imported=[DependencyInfo(path="a.py", imported_by_count=1, imports_count=0)],
+        most_importing=[DependencyInfo(path="b.py", imported_by_count=0, imports_count=1)],
+        isolated_files=["c.py"],
+        circular_dependencies=[],
+    )
+    with patch(
+        "app.main.analyze_repository_dependencies",
+        return_value=dependencies
+    ):
+        response = client.post("/analyze/dependencies", json={"url": "https://github.com/a/b"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == dependencies.model_dump(mode="json")
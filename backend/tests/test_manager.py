@@ -0,0 +1,47 @@
+import os
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from app.parsers import manager
+from app.parsers.manager import parse_files, shutdown_process_pool
+
+
+def _crash_worker(file_paths):
+    # Runs in the worker process, like a parse that gets OOM-killed
+    os._exit(1)
+
+
+@pytest.fixture
+def python_file(tmp_path: Path) -> Path:
+    file_path = tmp_path / "a.py"
+    file_path.write_text("def run():\n    pass\n", encoding="utf-8")
+    return file_path
+
+
+@pytest.mark.asyncio
+async def test_parse_files_retries_batch_on_new_pool(python_file: Path):
+    # Kill a worker, as an OOM kill would
+    broken_pool = manager._get_process_pool()
+    with pytest.raises(BrokenProcessPool):
+        broken_pool.submit(os._exit, 1).result()
+
+    try:
+        # The batch sent to the dead pool is retried on a fresh one
+        [(elements, imports)] = await parse_files([(python_file, "python")])
+        assert [el.name for el in elements] == ["run"]
+        assert manager._PY_POOL is not broken_pool
+    finally:
+        shutdown_process_pool()
+
+
+@pytest.mark.asyncio
+async def test_parse_files_drops_batch_that_keeps_crashing(python_file: Path, monkeypatch):
+    monkeypatch.setattr(manager, "parse_python_files", _crash_worker)
+
+    try:
+        assert await parse_files([(python_file, "python")]) == [None]
+        # The pool broken by the last attempt is not kept around
+        assert manager._PY_POOL is None
+    finally:
+        shutdown_process_pool()
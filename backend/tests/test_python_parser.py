@@ -1,13 +1,14 @@
+import os
+import time
 import pytest
 import textwrap
 from pathlib import Path
 
-from app.parsers.python_parser import parse_python_file
+from app.config import settings
+from app.parsers.python_parser import parse_python_file, prune_parse_cache
 
 
-@pytest.fixture
-def sample_python_file(tmp_path: Path) -> Path:
-    content = textwrap.dedent("""
+_PY_BYTES = textwrap.dedent("""
     import os
     import sys, json
     from pathlib import Path
@@ -20,29 +21,104 @@ def sample_python_file(tmp_path: Path) -> Path:
 
     def top_level_function():
         pass
-    """)
-    file_path = tmp_path / "sample.py"
-    file_path.write_text(content, encoding="utf-8")
+    """).encode("utf-8")
+
+
+@pytest.fixture(scope="session")
+def sample_python_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # The parsers only read this file, so one copy serves every test
+    file_path = tmp_path_factory.mktemp("python") / "sample.py"
+    file_path.write_bytes(_PY_BYTES)
     return file_path
 
 
-def test_parse_python_file_structure(sample_python_file: Path):
-    elements, imports = parse_python_file(sample_python_file)
+@pytest.fixture(scope="session")
+def parsed_python(sample_python_file: Path):
+    # Parsed once and shared; tests only assert on the result
+    return parse_python_file(sample_python_file)
+
+
+@pytest.fixture(scope="session")
+def py_element_map(parsed_python):
+    elements, _ = parsed_python
+    return {el.name: el for el in elements}
+
+
+def test_parse_python_file_structure(parsed_python, py_element_map):
+    elements, imports = parsed_python
 
     assert len(elements) == 3
-    element_map = {el.name: el for el in elements}
-    assert "MyClass" in element_map
-    assert "my_method" in element_map
-    assert "top_level_function" in element_map
+    assert "MyClass" in py_element_map
+    assert "my_method" in py_element_map
+    assert "top_level_function" in py_element_map
 
 
-def test_parse_python_file_imports(sample_python_file: Path):
-    elements, imports = parse_python_file(sample_python_file)
+def test_parse_python_file_imports(parsed_python):
+    elements, imports = parsed_python
 
     assert len(imports) == 6
-    assert "os" in imports
-    assert "sys" in imports
-    assert "json" in imports
-    assert "pathlib" in imports
-    assert ".local_util" in imports
-    assert "..parent_pkg" in imports
\ No newline at end of file
+    assert {"os", "sys", "json", "pathlib", ".local_util", "..parent_pkg"} <= frozenset(imports)
+
+def test_parse_python_file_annotations(tmp_path: Path):
+    file_path = tmp_path / "typed.py"
+    file_path.write_text(textwrap.dedent("""
+    import typing
+
+    class Repo(typing.Generic[T], base.Model):
+        def find(self, key: str) -> dict[str, list[int]]:
+            pass
+
+    def load() -> typing.Optional["Repo"]:
+        pass
+
+    def pick() -> int | None:
+        pass
+
+    def hook() -> Callable[[int, str], None]:
+        pass
+    """), encoding="utf-8")
+
+    elements, _ = parse_python_file(file_path)
+    element_map = {el.name: el for el in elements}
+
+    assert element_map["Repo"].base_classes == ["typing.Generic[T]", "base.Model"]
+    assert element_map["find"].return_type == "dict[str, list[int]]"
+    assert element_map["load"].return_type == "typing.Optional['Repo']"
+    assert element_map["pick"].return_type == "int | None"
+    assert element_map["hook"].return_type == "Callable[[int, str], None]"
+
+
+def test_parse_python_file_uses_content_cache(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "PARSE_CACHE_DIR", tmp_path / "cache")
+    source = "import os\n\ndef run():\n    pass\n"
+    first = tmp_path / "a.py"
+    second = tmp_path / "b.py"
+    first.write_text(source, encoding="utf-8")
+    second.write_text(source, encoding="utf-8")
+
+    elements, imports = parse_python_file(first)
+    assert len(list((tmp_path / "cache").rglob("*"))) == 2  # shard dir + entry
+
+    # Same contents under a different path is served from the cache
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("file was parsed again")
+
+    monkeypatch.setattr("app.parsers.python_parser._collect_definitions", fail_parse)
+    assert parse_python_file(second) == (elements, imports)
+
+
+def test_prune_parse_cache_removes_expired_entries(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "PARSE_CACHE_DIR", tmp_path / "cache")
+    for name in ("a.py", "b.py"):
+        (tmp_path / name).write_text(f"# {name}\n", encoding="utf-8")
+        parse_python_file(tmp_path / name)
+
+    expired_entry, fresh_entry = (tmp_path / "cache").glob("*/*")
+    stale = time.time() - settings.PARSE_CACHE_MAX_AGE_SECONDS - 60
+    os.utime(expired_entry, (stale, stale))
+
+    assert prune_parse_cache() == 1
+    assert not expired_entry.exists()
+    assert fresh_entry.exists()